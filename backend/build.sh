@@ -7,6 +7,10 @@ pip install -r requirements.txt
 
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py rebuild_search_index --if-empty
+python manage.py migrate_product_videos
+python manage.py reconcile_product_cards
+python manage.py process_pending_avatars
 
 # Create superuser
 python create_superuser.py
@@ -6,4 +6,44 @@ timeout = 120
 keepalive = 2
 max_requests = 1000
 max_requests_jitter = 100
-preload_app = True
\ No newline at end of file
+preload_app = True
+
+def post_worker_init(worker):
+    # Build the in-memory indexes before the worker takes traffic
+    try:
+        from store.autocomplete import suggestion_index
+        suggestion_index.build()
+    except Exception as e:
+        worker.log.warning(f"Autocomplete index not built at startup: {e}")
+
+    try:
+        from store.filter_engine import filter_engine
+        filter_engine.build()
+    except Exception as e:
+        worker.log.warning(f"Filter engine not built at startup: {e}")
+
+    try:
+        from store.spelling import spelling_corrector
+        spelling_corrector.build()
+    except Exception as e:
+        worker.log.warning(f"Spelling index not built at startup: {e}")
+
+    try:
+        from store.product_cards import card_reconciler
+        card_reconciler.start()
+    except Exception as e:
+        worker.log.warning(f"Product card reconciler not started: {e}")
+
+    try:
+        from store.avatars import resubmit_pending_avatars
+        resubmit_pending_avatars()
+    except Exception as e:
+        worker.log.warning(f"Pending profile pictures not queued: {e}")
+
+def worker_exit(server, worker):
+    # Write the search events still buffered in this worker
+    try:
+        from store.search_events import search_event_buffer
+        search_event_buffer.flush()
+    except Exception as e:
+        worker.log.warning(f"Search events not flushed on exit: {e}")
@@ -133,4 +133,7 @@ if not DEBUG:
         MEDIA_URL = '/media/'
         MEDIA_ROOT = BASE_DIR / 'media'
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Answer product list filters from the per-worker in-memory index (store/filter_engine.py)
+CATALOG_FILTER_ENGINE = os.getenv('CATALOG_FILTER_ENGINE', 'True').lower() == 'true'
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Product, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Offer
+from .models import Category, Product, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Offer, SearchSynonym
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -30,4 +30,11 @@ admin.site.register(Review)
 class OfferAdmin(admin.ModelAdmin):
     list_display = ['name', 'offer_type', 'is_active', 'start_date', 'end_date', 'used_count']
     list_filter = ['offer_type', 'is_active', 'start_date', 'end_date']
-    filter_horizontal = ['products', 'categories']
\ No newline at end of file
+    filter_horizontal = ['products', 'categories']
+
+@admin.register(SearchSynonym)
+class SearchSynonymAdmin(admin.ModelAdmin):
+    list_display = ['term', 'synonyms', 'two_way', 'is_active', 'updated_at']
+    list_filter = ['two_way', 'is_active']
+    list_editable = ['synonyms', 'two_way', 'is_active']
+    search_fields = ['term', 'synonyms']
@@ -8,6 +8,9 @@ class StoreConfig(AppConfig):
     name = 'store'
     
     def ready(self):
+        # Keep the search and autocomplete indexes in sync with product and category writes
+        from . import signals
+
         # Disable cleanup thread in production
         if os.environ.get('DEBUG', 'True') == 'True' and os.environ.get('RUN_MAIN') == 'true':
             self.start_offer_cleanup()
@@ -0,0 +1,145 @@
+import re
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from .models import Product, ProductAttribute
+
+MAX_KEY_LENGTH = 64
+MAX_VALUE_LENGTH = 255
+
+SPEC_PARAM_PREFIX = 'spec.'
+NUMERIC_LOOKUPS = {'gt', 'gte', 'lt', 'lte'}
+
+QUANTITY_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*([a-z"]+)?')
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Spellings of the same unit, and units stored in a larger base unit so
+# "512 GB" and "1 TB" compare correctly
+UNIT_ALIASES = {'inches': 'inch', 'in': 'inch', '"': 'inch', 'hrs': 'hours', 'hr': 'hours', 'h': 'hours'}
+UNIT_SCALES = {'tb': ('gb', 1024), 'mb': ('gb', 1 / 1024)}
+
+def normalize_key(key):
+    return re.sub(r'[^a-z0-9]+', '_', str(key).lower()).strip('_')[:MAX_KEY_LENGTH]
+
+def normalize_value(value):
+    return ' '.join(str(value).lower().split())[:MAX_VALUE_LENGTH]
+
+def parse_quantity(value):
+    """(number, unit) for values like "8 GB" or "6.1 inches", (None, '') otherwise"""
+    if isinstance(value, bool):
+        return None, ''
+    if isinstance(value, (int, float)):
+        return float(value), ''
+    match = QUANTITY_PATTERN.match(str(value).lower())
+    if not match:
+        return None, ''
+    number, unit = float(match.group(1)), UNIT_ALIASES.get(match.group(2) or '', match.group(2) or '')
+    if unit in UNIT_SCALES:
+        unit, scale = UNIT_SCALES[unit]
+        number *= scale
+    return number, unit
+
+def extract_attributes(specifications, prefix=''):
+    """(key, value, numeric_value, unit) rows for a specifications JSON object"""
+    if not isinstance(specifications, dict):
+        return []
+    rows = []
+    for raw_key, raw_value in specifications.items():
+        key = normalize_key(f'{prefix}_{raw_key}' if prefix else raw_key)
+        if not key:
+            continue
+        if isinstance(raw_value, dict):
+            # Nested groups become prefixed keys: {"camera": {"rear": ..}} -> camera_rear
+            rows.extend(extract_attributes(raw_value, prefix=key))
+            continue
+        values = raw_value if isinstance(raw_value, (list, tuple)) else [raw_value]
+        for value in values:
+            if value is None or isinstance(value, (dict, list, tuple)):
+                continue
+            normalized = normalize_value(value)
+            if not normalized:
+                continue
+            number, unit = parse_quantity(value)
+            rows.append((key, normalized, number, unit))
+    return list(dict.fromkeys(rows))
+
+def index_product_attributes(products):
+    """Replace the attribute rows of the given products"""
+    products = list(products)
+    rows = [
+        ProductAttribute(product=product, key=key, value=value, numeric_value=number, unit=unit)
+        for product in products
+        for key, value, number, unit in extract_attributes(product.specifications)
+    ]
+    with transaction.atomic():
+        ProductAttribute.objects.filter(product__in=products).delete()
+        ProductAttribute.objects.bulk_create(rows, batch_size=1000)
+
+def rebuild_attribute_index(chunk_size=500):
+    ProductAttribute.objects.all().delete()
+    products = Product.objects.only('id', 'specifications').order_by('id')
+    batch = []
+    count = 0
+    for product in products.iterator(chunk_size=chunk_size):
+        batch.append(product)
+        if len(batch) >= chunk_size:
+            index_product_attributes(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        index_product_attributes(batch)
+        count += len(batch)
+    return count
+
+def _key_conditions(name):
+    """
+    (condition, scale) pairs for a filter name: `ram_gb` matches the key itself,
+    or key `ram` stored with unit `gb`. Bare numbers are in the name's unit, so
+    for units stored scaled (`storage_tb` as `gb`) they are multiplied by `scale`.
+    """
+    key = normalize_key(name)
+    conditions = [(Q(key=key), 1)]
+    base, _, unit = key.rpartition('_')
+    if base and unit:
+        unit = UNIT_ALIASES.get(unit, unit)
+        unit, scale = UNIT_SCALES.get(unit, (unit, 1))
+        conditions.append((Q(key=base, unit=unit), scale))
+    return conditions
+
+def spec_condition(name, lookup, raw_value):
+    """Attribute rows matching one `spec.<name>[__<lookup>]=<value>` filter"""
+    if lookup in NUMERIC_LOOKUPS:
+        number, unit = parse_quantity(raw_value)
+        if number is None:
+            raise ValidationError({f'{SPEC_PARAM_PREFIX}{name}__{lookup}': 'A number is required.'})
+        condition = Q()
+        for key_condition, scale in _key_conditions(name):
+            # A value with its own unit ("1 TB") is already in the stored unit
+            condition |= key_condition & Q(**{f'numeric_value__{lookup}': number if unit else number * scale})
+        return condition
+    if lookup:
+        raise ValidationError({f'{SPEC_PARAM_PREFIX}{name}__{lookup}': 'Unsupported lookup.'})
+
+    # Comma separated values match any of them, bare numbers match numerically too
+    values = [value.strip() for value in raw_value.split(',') if value.strip()]
+    condition = Q()
+    for key_condition, scale in _key_conditions(name):
+        matches = Q()
+        for value in values:
+            matches |= Q(value=normalize_value(value))
+            if NUMBER_PATTERN.fullmatch(value):
+                matches |= Q(numeric_value=float(value) * scale)
+        condition |= key_condition & matches
+    return condition
+
+def apply_spec_filters(queryset, params):
+    """Filter products by every `spec.` query param, each answered from the attribute index"""
+    for param, raw_value in params.items():
+        if not param.startswith(SPEC_PARAM_PREFIX) or not raw_value.strip():
+            continue
+        name, _, lookup = param[len(SPEC_PARAM_PREFIX):].partition('__')
+        if not normalize_key(name):
+            continue
+        matches = ProductAttribute.objects.filter(spec_condition(name, lookup, raw_value))
+        queryset = queryset.filter(id__in=matches.values('product_id'))
+    return queryset
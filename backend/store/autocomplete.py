@@ -0,0 +1,229 @@
+import threading
+import time
+from django.db import connections
+from .models import Category, Product
+from .search_index import tokenize
+
+SUGGESTION_LIMITS = {'products': 5, 'brands': 3, 'categories': 3}
+
+# Ranked completions cached per trie node
+CACHED_COMPLETIONS = 10
+
+# Safety net for writes made by other workers, whose signals never reach this process
+REBUILD_INTERVAL = 900
+
+class _TrieNode:
+    __slots__ = ('children', 'keys', 'best')
+
+    def __init__(self):
+        self.children = {}
+        self.keys = set()  # Suggestions containing the word that ends at this node
+        self.best = None   # Cached ranked completions for this prefix
+
+class PrefixTrie:
+    """Trie over the words of weighted suggestions, so any word of a suggestion can be completed"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.weights = {}
+        self.display = {}
+
+    def add(self, text, weight=1):
+        """Add weight to a suggestion, removing it once its weight drops to zero"""
+        words = tokenize(text)
+        if not words:
+            return
+        key = ' '.join(words)
+
+        current = self.weights.get(key, 0)
+        new_weight = current + weight
+        if new_weight <= 0:
+            self.weights.pop(key, None)
+            self.display.pop(key, None)
+            for word in set(words):
+                self._update_word(word, key, remove=True)
+            return
+
+        self.weights[key] = new_weight
+        self.display.setdefault(key, text.strip())
+        # Also clears the cached rankings along each word's path
+        for word in set(words):
+            self._update_word(word, key)
+
+    def _update_word(self, word, key, remove=False):
+        node = self.root
+        node.best = None
+        for char in word:
+            if char not in node.children:
+                if remove:
+                    return
+                node.children[char] = _TrieNode()
+            node = node.children[char]
+            node.best = None
+        if remove:
+            node.keys.discard(key)
+        else:
+            node.keys.add(key)
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _collect(self, node):
+        keys = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            keys.update(current.keys)
+            stack.extend(current.children.values())
+        return keys
+
+    def _rank(self, keys, first_word, limit):
+        # Suggestions starting with the query first, then by weight, then shortest
+        ranked = sorted(keys, key=lambda key: (
+            not key.startswith(first_word), -self.weights[key], len(key), key
+        ))
+        return [self.display[key] for key in ranked[:limit]]
+
+    def complete(self, query, limit):
+        words = tokenize(query)
+        if not words:
+            return []
+        *complete_words, prefix = words
+
+        node = self._find(prefix)
+        if node is None:
+            return []
+
+        if not complete_words:
+            if node.best is None:
+                node.best = self._rank(self._collect(node), prefix, CACHED_COMPLETIONS)
+            return node.best[:limit]
+
+        # Earlier words must appear in full, the last one is completed
+        candidates = self._collect(node)
+        for word in complete_words:
+            word_node = self._find(word)
+            if word_node is None:
+                return []
+            candidates &= word_node.keys
+        return self._rank(candidates, words[0], limit)
+
+class SuggestionIndex:
+    """Per-worker autocomplete index over product names, brands and category names"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built_at = None
+        self.rebuilding = False
+        self.products = PrefixTrie()
+        self.brands = PrefixTrie()
+        self.categories = PrefixTrie()
+        self.product_entries = {}
+        self.category_names = {}
+
+    def build(self):
+        products = PrefixTrie()
+        brands = PrefixTrie()
+        categories = PrefixTrie()
+        product_entries = {}
+
+        rows = Product.objects.filter(available=True).values_list('id', 'name', 'brand')
+        for product_id, name, brand in rows.iterator(chunk_size=2000):
+            product_entries[product_id] = (name, brand)
+            products.add(name)
+            if brand:
+                brands.add(brand)
+
+        category_names = dict(Category.objects.values_list('id', 'name'))
+        for name in category_names.values():
+            categories.add(name)
+
+        with self.lock:
+            self.products = products
+            self.brands = brands
+            self.categories = categories
+            self.product_entries = product_entries
+            self.category_names = category_names
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None:
+            with self.lock:
+                if self.built_at is None:
+                    self.build()
+        elif time.monotonic() - self.built_at > REBUILD_INTERVAL and not self.rebuilding:
+            self.rebuilding = True
+            threading.Thread(target=self._background_rebuild, daemon=True).start()
+
+    def _background_rebuild(self):
+        try:
+            self.build()
+        except Exception as e:
+            print(f"Suggestion index rebuild error: {e}")
+        finally:
+            connections.close_all()
+            self.rebuilding = False
+
+    def update_product(self, product):
+        if self.built_at is None:
+            return
+        entry = (product.name, product.brand) if product.available else None
+        with self.lock:
+            previous = self.product_entries.get(product.id)
+            if previous == entry:
+                return
+            self._apply_product(previous, -1)
+            self._apply_product(entry, 1)
+            if entry:
+                self.product_entries[product.id] = entry
+            else:
+                self.product_entries.pop(product.id, None)
+
+    def remove_product(self, product_id):
+        if self.built_at is None:
+            return
+        with self.lock:
+            self._apply_product(self.product_entries.pop(product_id, None), -1)
+
+    def _apply_product(self, entry, weight):
+        if not entry:
+            return
+        name, brand = entry
+        self.products.add(name, weight)
+        if brand:
+            self.brands.add(brand, weight)
+
+    def update_category(self, category):
+        if self.built_at is None:
+            return
+        with self.lock:
+            previous = self.category_names.get(category.id)
+            if previous == category.name:
+                return
+            if previous:
+                self.categories.add(previous, -1)
+            self.categories.add(category.name)
+            self.category_names[category.id] = category.name
+
+    def remove_category(self, category_id):
+        if self.built_at is None:
+            return
+        with self.lock:
+            previous = self.category_names.pop(category_id, None)
+            if previous:
+                self.categories.add(previous, -1)
+
+    def suggest(self, query):
+        self.ensure_built()
+        return {
+            'products': self.products.complete(query, SUGGESTION_LIMITS['products']),
+            'brands': self.brands.complete(query, SUGGESTION_LIMITS['brands']),
+            'categories': self.categories.complete(query, SUGGESTION_LIMITS['categories']),
+        }
+
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,122 @@
+import hashlib
+import os
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from PIL import Image, ImageOps, UnidentifiedImageError
+from .image_pipeline import ImagePipeline
+from .models import UserProfile
+
+# Square avatar sizes; `large` is also stored as the profile picture
+AVATAR_SIZES = {'small': 64, 'medium': 128, 'large': 256}
+AVATAR_DIR = 'profiles/avatars'
+AVATAR_QUALITY = 85
+MAX_AVATAR_UPLOAD_BYTES = 15 * 1024 * 1024
+
+# Shown while an upload is being processed
+AVATAR_PLACEHOLDER = 'store/avatar-placeholder.svg'
+
+def stage_profile_picture(profile, upload):
+    """
+    Keep an uploaded picture for the avatar worker, replacing any upload still
+    waiting. Only the image header is read here; raises ValueError for non-images.
+    """
+    if upload.size > MAX_AVATAR_UPLOAD_BYTES:
+        raise ValueError('Profile picture must be smaller than 15 MB')
+    try:
+        with Image.open(upload) as image:
+            if image.format not in ('JPEG', 'PNG', 'WEBP', 'GIF', 'MPO'):
+                raise ValueError('Profile picture must be a JPEG, PNG, WebP or GIF image')
+    except UnidentifiedImageError:
+        raise ValueError('Profile picture must be an image')
+    upload.seek(0)
+
+    previous = profile.profile_picture_pending.name if profile.profile_picture_pending else None
+    profile.profile_picture_pending.save(os.path.basename(upload.name), upload, save=False)
+    if previous:
+        default_storage.delete(previous)
+
+def render_avatars(profile_id, data):
+    """Square, EXIF-free WebP avatars of an uploaded picture, returns {size: file name}"""
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    with Image.open(BytesIO(data)) as source:
+        # Applies the camera orientation; re-encoding without `exif` drops the rest of the metadata
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    names = {}
+    for size, pixels in AVATAR_SIZES.items():
+        avatar = ImageOps.fit(image, (pixels, pixels), Image.LANCZOS)
+        output = BytesIO()
+        avatar.save(output, 'WEBP', quality=AVATAR_QUALITY, method=4)
+        # The profile id keeps two users' identical pictures apart, so either can be deleted
+        names[size] = default_storage.save(f'{AVATAR_DIR}/{profile_id}-{digest}-{size}.webp', ContentFile(output.getvalue()))
+    return names
+
+def process_profile_picture(profile_id):
+    profile = UserProfile.objects.filter(id=profile_id).only(
+        'id', 'profile_picture', 'profile_picture_pending', 'avatar_variants'
+    ).first()
+    if profile is None or not profile.profile_picture_pending:
+        return False
+
+    pending = profile.profile_picture_pending.name
+    current = UserProfile.objects.filter(id=profile_id, profile_picture_pending=pending)
+    try:
+        with default_storage.open(pending, 'rb') as upload:
+            names = render_avatars(profile_id, upload.read())
+    except Exception as e:
+        print(f"Profile picture error for profile {profile_id}: {e}")
+        # Dropped, the previous picture stays
+        if current.update(profile_picture_pending=None):
+            default_storage.delete(pending)
+        return False
+
+    previous = [profile.profile_picture.name] if profile.profile_picture else []
+    previous += list((profile.avatar_variants or {}).values())
+    # Swapped only if no newer upload replaced this one meanwhile
+    if not current.update(profile_picture=names['large'], avatar_variants=names, profile_picture_pending=None):
+        for name in names.values():
+            default_storage.delete(name)
+        return False
+
+    default_storage.delete(pending)
+    for name in set(previous) - set(names.values()):
+        default_storage.delete(name)
+    return True
+
+def profile_image_status(profile):
+    if profile.profile_picture_pending:
+        return 'processing'
+    return 'ready' if profile.profile_picture else None
+
+def profile_image_urls(profile):
+    """URLs of each avatar size, the placeholder for all of them while an upload is processed"""
+    if profile.profile_picture_pending:
+        placeholder = static(AVATAR_PLACEHOLDER)
+        return dict.fromkeys(AVATAR_SIZES, placeholder)
+    if profile.avatar_variants:
+        return {size: default_storage.url(name) for size, name in profile.avatar_variants.items()}
+    if profile.profile_picture:
+        # Pictures uploaded before avatars were processed
+        return dict.fromkeys(AVATAR_SIZES, profile.profile_picture.url)
+    return None
+
+avatar_pipeline = ImagePipeline(process_profile_picture, workers=1, name='avatars')
+
+def pending_profile_ids():
+    return UserProfile.objects.filter(profile_picture_pending__isnull=False).exclude(
+        profile_picture_pending=''
+    ).values_list('id', flat=True)
+
+def resubmit_pending_avatars():
+    """
+    Queue every upload still waiting. Jobs only live in the worker that took
+    the upload, so the ones lost when it was recycled or crashed are picked up
+    by the next worker to start; a job already running elsewhere is harmless.
+    """
+    profile_ids = list(pending_profile_ids())
+    for profile_id in profile_ids:
+        avatar_pipeline.submit(profile_id)
+    return len(profile_ids)
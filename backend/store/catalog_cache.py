@@ -0,0 +1,54 @@
+import hashlib
+import time
+from django.core.cache import cache
+from rest_framework.response import Response
+
+# Responses are also invalidated by version bumps, this only bounds how long
+# another process's local-memory cache can lag behind a write
+CATALOG_CACHE_TIMEOUT = 300
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so a lost counter can never come back to a version already used
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response at once"""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+def catalog_cache_key(prefix, request):
+    # Parameter order, blanks and surrounding whitespace don't change the response
+    params = sorted(
+        (key, value.strip())
+        for key, values in request.query_params.lists()
+        for value in values if value.strip()
+    )
+    raw = f'{request.get_host()}|{request.path}|{params}'
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'catalog:{get_catalog_version()}:{prefix}:{digest}'
+
+def cached_response(request, prefix, build, timeout=CATALOG_CACHE_TIMEOUT):
+    """
+    Serve `build()`'s response from the catalog cache. Only 200 responses are
+    stored; `timeout` may be a callable taking the fresh response.
+    """
+    key = catalog_cache_key(prefix, request)
+    data = cache.get(key)
+    if data is not None:
+        return Response(data, headers={'X-Cache': 'HIT'})
+
+    response = build()
+    if response.status_code == 200:
+        seconds = timeout(response) if callable(timeout) else timeout
+        if seconds > 0:
+            cache.set(key, response.data, seconds)
+    response['X-Cache'] = 'MISS'
+    return response
@@ -70,7 +70,8 @@ def simple_checkout(request):
             product.stock = max(0, product.stock - item.quantity)
             if product.stock == 0:
                 product.available = False
-            product.save()
+            # Only the stock columns, so the search and attribute indexes are left alone
+            product.save(update_fields=['stock', 'available', 'updated'])
         
         # Clear cart
         cart_items.delete()
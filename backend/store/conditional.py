@@ -0,0 +1,53 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils import timezone
+from .models import Category, Offer, Product
+
+# ETag and Last-Modified functions for django.views.decorators.http.condition.
+# Each looks up only row versions, so a matching If-None-Match is answered
+# with a 304 before anything is loaded or serialized. Lists get no
+# Last-Modified: removing a row doesn't move their newest timestamp.
+
+def _version(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+
+def _params(request):
+    return sorted(request.GET.lists())
+
+def _product_row(request, **lookup):
+    # Shared by the ETag and Last-Modified functions of one request
+    if not hasattr(request, '_product_row'):
+        request._product_row = Product.objects.filter(**lookup).values_list('id', 'updated').first()
+    return request._product_row
+
+def product_detail_etag(request, slug):
+    row = _product_row(request, slug=slug, available=True)
+    return f'p{row[0]}-{row[1].timestamp():.6f}' if row else None
+
+def product_detail_last_modified(request, slug):
+    row = _product_row(request, slug=slug, available=True)
+    return row[1] if row else None
+
+def product_by_id_etag(request, product_id):
+    row = _product_row(request, id=product_id)
+    return f'p{row[0]}-{row[1].timestamp():.6f}' if row else None
+
+def product_by_id_last_modified(request, product_id):
+    row = _product_row(request, id=product_id)
+    return row[1] if row else None
+
+def category_list_etag(request):
+    stats = Category.objects.aggregate(count=Count('id'), updated=Max('updated'))
+    return f"c-{_version(stats['count'], stats['updated'], _params(request))}"
+
+def active_offers_etag(request):
+    now = timezone.now()
+    offers = Offer.objects.filter(is_active=True, start_date__lte=now, end_date__gt=now)
+    rows = list(offers.order_by('id').values_list('id', 'updated_at'))
+    # Offers embed their products and categories
+    related = offers.aggregate(
+        products=Max('products__updated'),
+        free_product=Max('free_product__updated'),
+        categories=Max('categories__updated')
+    )
+    return f"o-{_version(rows, sorted(related.items()))}"
@@ -0,0 +1,233 @@
+import threading
+import time
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max
+from .catalog_cache import get_catalog_version
+from .models import Category, Product
+from .product_filters import get_sort_ordering, has_search
+from .attribute_index import SPEC_PARAM_PREFIX
+
+# The catalog version only moves for writes made in this process, so the
+# database is checked this often for imports, commands and other workers
+SIGNATURE_CHECK_INTERVAL = 30
+# Safety net for writes that touch neither the version nor `updated`
+REBUILD_INTERVAL = 900
+
+def catalog_signature():
+    products = Product.objects.aggregate(count=Count('id'), updated=Max('updated'))
+    categories = Category.objects.aggregate(count=Count('id'), updated=Max('updated'))
+    return products['count'], products['updated'], categories['count'], categories['updated']
+
+class FilterMatches:
+    """Ids of the products matching a list request, in the order of `ordering`"""
+
+    def __init__(self, ids, ordering):
+        self.ids = ids
+        self.ordering = list(ordering)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position_after(self, product_id):
+        """Index of the first match after the given product, None when it is no longer a match"""
+        found = np.flatnonzero(self.ids == product_id)
+        return int(found[0]) + 1 if len(found) else None
+
+class FilterEngine:
+    """
+    Per-worker in-memory index of the available products for the list filters.
+
+    Every category, brand and stock state has a packed bitset over the
+    products, and each sort has its positions presorted, so a request is a
+    few vectorized AND/OR operations and one take. It is rebuilt when the
+    catalog version moves or the database signature changes, and `query()`
+    returns None until then so the caller uses the ORM. Other processes'
+    writes are only seen at the next signature check, and writes missed by
+    both are picked up by the periodic rebuild.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.signature = None
+        self.outdated = False
+        self.built_at = None
+        self.checked_at = None
+        self.rebuilding = False
+        self.size = 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.price = np.zeros(0)
+        self.rating = np.zeros(0)
+        self.categories = {}
+        self.category_bits = {}
+        self.brand_bits = {}
+        self.stock_bits = {}
+        self.orders = {}
+
+    def build(self):
+        # Read the version first, so writes made during the build trigger another one
+        version = get_catalog_version()
+        signature = catalog_signature()
+        rows = list(
+            Product.objects.filter(available=True).order_by('name', 'id').values_list(
+                'id', 'category_id', 'brand', 'price', 'stock', 'average_rating', 'rating_count', 'created'
+            )
+        )
+        size = len(rows)
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=size)
+        category_ids = np.fromiter((row[1] or 0 for row in rows), dtype=np.int64, count=size)
+        price = np.fromiter((float(row[3]) for row in rows), dtype=np.float64, count=size)
+        stock = np.fromiter((row[4] for row in rows), dtype=np.int64, count=size)
+        rating = np.fromiter((row[5] or 0 for row in rows), dtype=np.float64, count=size)
+        rating_count = np.fromiter((row[6] for row in rows), dtype=np.int64, count=size)
+        created = np.fromiter((row[7].timestamp() for row in rows), dtype=np.float64, count=size)
+
+        brands = {}
+        for position, row in enumerate(rows):
+            if row[2]:
+                brands.setdefault(row[2], []).append(position)
+
+        # Rows come in name order, so collation matches the database; the
+        # other sorts are lexsorts whose last key is the primary one
+        orders = {
+            'name': np.arange(size),
+            'price_low': np.lexsort((ids, price)),
+            'price_high': np.lexsort((ids, -price)),
+            'newest': np.lexsort((-ids, -created)),
+            'rating': np.lexsort((-ids, -rating_count, -rating)),
+        }
+
+        categories = {
+            category_id: (slug, name.lower())
+            for category_id, slug, name in Category.objects.values_list('id', 'slug', 'name')
+        }
+        in_stock = stock > 0
+
+        with self.lock:
+            self.size = size
+            self.ids = ids
+            self.price = price
+            self.rating = rating
+            self.categories = categories
+            self.category_bits = {
+                category_id: np.packbits(category_ids == category_id) for category_id in categories
+            }
+            self.brand_bits = {brand: self._bits_at(positions, size) for brand, positions in brands.items()}
+            self.stock_bits = {'true': np.packbits(in_stock), 'false': np.packbits(~in_stock)}
+            self.orders = orders
+            self.version = version
+            self.signature = signature
+            self.outdated = False
+            self.built_at = self.checked_at = time.monotonic()
+
+    def _bits_at(self, positions, size):
+        mask = np.zeros(size, dtype=bool)
+        mask[positions] = True
+        return np.packbits(mask)
+
+    def _union(self, bitsets):
+        result = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for bits in bitsets:
+            np.bitwise_or(result, bits, out=result)
+        return result
+
+    def _background_rebuild(self):
+        try:
+            self.build()
+        except Exception as e:
+            print(f"Filter engine rebuild error: {e}")
+        finally:
+            connections.close_all()
+            self.rebuilding = False
+
+    def _schedule_rebuild(self):
+        if not self.rebuilding:
+            self.rebuilding = True
+            threading.Thread(target=self._background_rebuild, daemon=True).start()
+
+    def is_current(self):
+        """Whether the index reflects the catalog as far as it knows, scheduling a rebuild when it doesn't"""
+        if not getattr(settings, 'CATALOG_FILTER_ENGINE', True):
+            return False
+        if self.version is None:
+            with self.lock:
+                if self.version is None:
+                    self.build()
+            return True
+
+        now = time.monotonic()
+        if not self.outdated and self.version != get_catalog_version():
+            self.outdated = True
+        if not self.outdated and now - self.checked_at > SIGNATURE_CHECK_INTERVAL:
+            self.checked_at = now
+            self.outdated = self.signature != catalog_signature()
+        if self.outdated:
+            self._schedule_rebuild()
+            return False
+        if now - self.built_at > REBUILD_INTERVAL:
+            # Served meanwhile, nothing is known to have changed
+            self._schedule_rebuild()
+        return True
+
+    def supports(self, params):
+        # Search and spec filters need the database indexes
+        return not has_search(params) and not any(param.startswith(SPEC_PARAM_PREFIX) for param in params)
+
+    def query(self, params, sort_by=None):
+        """FilterMatches for the list params, or None when the ORM should answer instead"""
+        if not self.supports(params):
+            return None
+        try:
+            if not self.is_current():
+                return None
+            with self.lock:
+                return self._query(params, sort_by)
+        except (TypeError, ValueError):
+            # Malformed numbers get the ORM's own error handling
+            return None
+        except Exception as e:
+            print(f"Filter engine error: {e}")
+            return None
+
+    def _query(self, params, sort_by):
+        bits = np.full((self.size + 7) // 8, 0xFF, dtype=np.uint8)
+
+        category_slug = params.get('category')
+        if category_slug:
+            name = category_slug.replace('-', ' ').lower()
+            np.bitwise_and(bits, self._union(
+                self.category_bits[category_id]
+                for category_id, (slug, category_name) in self.categories.items()
+                if slug == category_slug or name in category_name
+            ), out=bits)
+
+        brand = params.get('brand')
+        if brand:
+            np.bitwise_and(bits, self._union(
+                self.brand_bits[value] for value in set(brand.split(',')) if value in self.brand_bits
+            ), out=bits)
+
+        in_stock = params.get('in_stock')
+        if in_stock in self.stock_bits:
+            np.bitwise_and(bits, self.stock_bits[in_stock], out=bits)
+
+        mask = np.unpackbits(bits, count=self.size).astype(bool)
+
+        min_price = params.get('min_price')
+        if min_price:
+            mask &= self.price >= float(min_price)
+        max_price = params.get('max_price')
+        if max_price:
+            mask &= self.price <= float(max_price)
+
+        min_rating = params.get('min_rating')
+        if min_rating:
+            mask &= self.rating >= float(min_rating)
+
+        order = self.orders.get(sort_by, self.orders['name'])
+        positions = order[mask[order]]
+        return FilterMatches(self.ids[positions], get_sort_ordering(sort_by))
+
+filter_engine = FilterEngine()
@@ -0,0 +1,191 @@
+import base64
+import binascii
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import unquote_to_bytes
+from urllib.request import Request, urlopen
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .catalog_cache import bump_catalog_version
+from .models import Product
+
+# Longest side of each derivative; images are never scaled up
+DERIVATIVE_SIZES = {'thumbnail': 160, 'card': 480, 'zoom': 1600}
+DERIVATIVE_FORMAT = 'WEBP'
+DERIVATIVE_EXTENSION = '.webp'
+DERIVATIVE_QUALITY = 82
+# Part of every derivative's content hash - bump it when the sizes or the
+# encoding change, so new derivatives never reuse the old (cached forever) names
+DERIVATIVE_VERSION = 1
+DERIVATIVE_DIR = 'products/derived'
+DERIVATIVE_NAME_PATTERN = re.compile(r'^[0-9a-f]{16}-(%s)\.webp$' % '|'.join(DERIVATIVE_SIZES))
+
+IMAGE_FIELDS = {'image', 'image_url', 'image_urls'}
+IMAGE_WORKERS = 2
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+FETCH_TIMEOUT = 10
+
+def image_sources(product):
+    """Every image of a product, as an image URL or the stored upload's name"""
+    sources = [product.image_url, *(product.image_urls or [])]
+    if product.image:
+        sources.append(product.image.name)
+    return list(dict.fromkeys(source for source in sources if isinstance(source, str) and source))
+
+def primary_source(product):
+    # The image product cards show
+    return (product.image_urls or [None])[0] or product.image_url or (product.image.name if product.image else None)
+
+def source_key(source):
+    # image_variants key of a source; uploads from the admin dashboard are data: URLs megabytes long
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+def source_derivatives(product, source):
+    return (product.image_variants or {}).get(source_key(source)) if source else None
+
+def needs_derivatives(product):
+    return {source_key(source) for source in image_sources(product)} != set(product.image_variants or {})
+
+def read_data_url(source):
+    header, _, payload = source.partition(',')
+    # Checked before decoding, base64 is a third larger than the image
+    if len(payload) * 3 // 4 > MAX_SOURCE_BYTES:
+        raise ValueError('Image is too large')
+    if header.endswith(';base64'):
+        try:
+            return base64.b64decode(payload, validate=True)
+        except binascii.Error:
+            raise ValueError('Invalid base64 image data')
+    return unquote_to_bytes(payload)
+
+def read_source(source):
+    if source.startswith(('http://', 'https://')):
+        request = Request(source, headers={'User-Agent': 'E-Mart image pipeline'})
+        with urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            data = response.read(MAX_SOURCE_BYTES + 1)
+    elif source.startswith('data:'):
+        data = read_data_url(source)
+    elif '://' in source:
+        raise ValueError('Unsupported image source')
+    else:
+        with default_storage.open(source, 'rb') as stored:
+            data = stored.read(MAX_SOURCE_BYTES + 1)
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ValueError('Image is too large')
+    return data
+
+def render_derivatives(data):
+    """
+    Store the thumbnail, card and zoom derivatives of an image under names
+    hashed from its content, skipping the ones already stored. Returns
+    {size: {'name', 'width', 'height'}}.
+    """
+    digest = hashlib.sha256(data + f'v{DERIVATIVE_VERSION}'.encode()).hexdigest()[:16]
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    derivatives = {}
+    for size, longest in DERIVATIVE_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((longest, longest), Image.LANCZOS)
+        name = f'{DERIVATIVE_DIR}/{digest}-{size}{DERIVATIVE_EXTENSION}'
+        if not default_storage.exists(name):
+            output = BytesIO()
+            resized.save(output, DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY, method=4)
+            default_storage.save(name, ContentFile(output.getvalue()))
+        derivatives[size] = {'name': name, 'width': resized.width, 'height': resized.height}
+    return derivatives
+
+def process_product_images(product_id):
+    """Create the missing derivatives of a product's images, returns whether anything changed"""
+    product = Product.objects.filter(id=product_id).only('id', 'image', 'image_url', 'image_urls', 'image_variants').first()
+    if product is None or not needs_derivatives(product):
+        return False
+
+    variants = dict(product.image_variants or {})
+    for source in image_sources(product):
+        key = source_key(source)
+        if key in variants:
+            continue
+        try:
+            variants[key] = render_derivatives(read_source(source))
+        except Exception as e:
+            # Recorded without derivatives so a broken image isn't retried until it changes;
+            # clients keep using the original
+            print(f"Image derivative error for product {product_id} ({source[:80]}): {e}")
+            variants[key] = {}
+
+    # The images may have changed while these were rendered, only current ones are kept
+    current = Product.objects.filter(id=product_id).only('id', 'image', 'image_url', 'image_urls').first()
+    if current is None:
+        return False
+    keys = [source_key(source) for source in image_sources(current)]
+    variants = {key: variants[key] for key in keys if key in variants}
+    # update() sends no post_save, which would queue the product again
+    Product.objects.filter(id=product_id).update(image_variants=variants, updated=timezone.now())
+    # Imported here, product_cards builds on this module
+    from .product_cards import refresh_product_cards
+    refresh_product_cards([product_id])
+    bump_catalog_version()
+    return True
+
+def derivative_urls(derivatives, build_url):
+    """srcset-style map of one image's derivatives, None when there are none"""
+    if not derivatives:
+        return None
+    urls = {size: build_url(entry['name']) for size, entry in derivatives.items()}
+    widths = {}
+    for size in DERIVATIVE_SIZES:
+        if size in derivatives:
+            widths.setdefault(derivatives[size]['width'], urls[size])
+    urls['srcset'] = ', '.join(f'{url} {width}w' for width, url in sorted(widths.items()))
+    return urls
+
+class ImagePipeline:
+    """
+    Per-worker pool that runs image processing jobs off the request path. A
+    key queued again while its job runs is processed once more afterwards.
+    """
+
+    def __init__(self, process, workers=IMAGE_WORKERS, name='image-pipeline'):
+        self.process = process
+        self.workers = workers
+        self.name = name
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pending = set()
+        self.requeued = set()
+
+    def submit(self, key):
+        with self.lock:
+            if key in self.pending:
+                self.requeued.add(key)
+                return
+            self.pending.add(key)
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        self.executor.submit(self._run, key)
+
+    def _run(self, key):
+        try:
+            self.process(key)
+        except Exception as e:
+            print(f"{self.name} error for {key}: {e}")
+        finally:
+            # Pool threads would otherwise keep their connections open between jobs
+            connections.close_all()
+            with self.lock:
+                self.pending.discard(key)
+                again = key in self.requeued
+                self.requeued.discard(key)
+            if again:
+                self.submit(key)
+
+image_pipeline = ImagePipeline(process_product_images, name='image-derivatives')
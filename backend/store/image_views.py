@@ -0,0 +1,33 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from .image_pipeline import DERIVATIVE_DIR, DERIVATIVE_NAME_PATTERN
+
+# Derivative names are hashed from their content, so one never changes
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def product_image(request, name):
+    """Serve a product image derivative"""
+    if not DERIVATIVE_NAME_PATTERN.match(name):
+        raise Http404('Unknown image')
+
+    headers = {
+        'ETag': f'"{name.split(".")[0]}"',
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL,
+    }
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return HttpResponse(status=304, headers=headers)
+
+    path = f'{DERIVATIVE_DIR}/{name}'
+    try:
+        image = default_storage.open(path, 'rb')
+    except OSError:
+        raise Http404('Image file missing')
+
+    response = FileResponse(image, content_type='image/webp')
+    for header, value in headers.items():
+        response[header] = value
+    return response
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from store.image_pipeline import needs_derivatives, process_product_images
+from store.models import Product
+
+class Command(BaseCommand):
+    help = 'Render the missing thumbnail, card and zoom derivatives of product images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', type=int, action='append', help='Only this product id (repeatable)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rendering product image derivatives...')
+        
+        products = Product.objects.only('id', 'image', 'image_url', 'image_urls', 'image_variants').order_by('id')
+        if options['product']:
+            products = products.filter(id__in=options['product'])
+        
+        processed = 0
+        for product in products.iterator(chunk_size=500):
+            if needs_derivatives(product) and process_product_images(product.id):
+                processed += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'Image derivatives rendered for {processed} products'))
@@ -0,0 +1,39 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from store.product_import import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, ProductImporter, import_format, read_rows
+
+class Command(BaseCommand):
+    help = 'Create and update products from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='File format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help=f'Rows written per transaction (default: {IMPORT_CHUNK_SIZE})')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without saving anything')
+        parser.add_argument('--report', help='Write the per-row report to this JSONL file')
+
+    def handle(self, *args, **options):
+        try:
+            fmt = import_format(options['path'], options['format'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        importer = ProductImporter(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        report = open(options['report'], 'w') if options['report'] else None
+        try:
+            with open(options['path'], 'rb') as stream:
+                for entry in importer.run(read_rows(stream, fmt)):
+                    if report:
+                        report.write(json.dumps(entry) + '\n')
+                    elif entry['status'] == 'error':
+                        self.stdout.write(self.style.ERROR(f"Line {entry['line']}: {entry['errors']}"))
+        finally:
+            if report:
+                report.close()
+        
+        summary = importer.summary
+        prefix = 'Dry run: ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{summary['rows']} rows, {summary['created']} created, "
+            f"{summary['updated']} updated, {summary['errors']} errors"
+        ))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from store.models import Product
+from store.video_utils import decode_data_url, save_product_video
+
+class Command(BaseCommand):
+    help = 'Move base64 product videos out of the database into media storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='Product ids fetched per batch (default: 20)')
+
+    def handle(self, *args, **options):
+        pending = Product.objects.exclude(video_file__isnull=True).exclude(video_file='')
+        moved = 0
+        failed = []
+
+        while True:
+            # Moved rows drop out of `pending`, failed ones are excluded explicitly
+            ids = list(pending.exclude(id__in=failed).order_by('id').values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+
+            for product_id in ids:
+                # One blob in memory at a time
+                product = Product.objects.only('id', 'video', 'video_file').get(id=product_id)
+                try:
+                    content, extension = decode_data_url(product.video_file)
+                    with content:
+                        save_product_video(product, content, extension)
+                    moved += 1
+                except ValueError as e:
+                    failed.append(product_id)
+                    self.stdout.write(self.style.WARNING(f'Product {product_id}: {e}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} product videos to media storage'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{len(failed)} products left untouched: {failed}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from store.avatars import pending_profile_ids, process_profile_picture
+
+class Command(BaseCommand):
+    help = 'Process profile picture uploads left waiting by a worker that stopped before handling them'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Processing pending profile pictures...')
+        
+        processed = 0
+        for profile_id in list(pending_profile_ids()):
+            if process_profile_picture(profile_id):
+                processed += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'Profile pictures processed: {processed}'))
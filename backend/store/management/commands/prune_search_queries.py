@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from store.search_rollup import prune_search_queries, RAW_RETENTION_DAYS
+
+class Command(BaseCommand):
+    help = 'Delete raw search events older than the retention period - they stay counted in the daily rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RAW_RETENTION_DAYS, help=f'Days of raw events to keep (default: {RAW_RETENTION_DAYS})')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows deleted per batch (default: 5000)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Pruning search events older than {options['days']} days...")
+        
+        deleted = prune_search_queries(days=options['days'], batch_size=options['batch_size'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} search events'))
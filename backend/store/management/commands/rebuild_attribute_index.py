@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from store.attribute_index import rebuild_attribute_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the product specification attribute index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Products indexed per batch (default: 500)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding product attribute index...')
+        
+        indexed = rebuild_attribute_index(chunk_size=options['chunk_size'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Attribute index rebuilt for {indexed} products'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from store.models import SearchIndexEntry
+from store.search_index import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the product search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Products indexed per batch (default: 500)')
+        parser.add_argument('--if-empty', action='store_true', help='Only build when the index has no entries yet')
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and SearchIndexEntry.objects.exists():
+            self.stdout.write('Search index already built, skipping')
+            return
+        
+        self.stdout.write('Rebuilding product search index...')
+        
+        indexed = rebuild_index(chunk_size=options['chunk_size'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {indexed} products'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from store.product_cards import reconcile_product_cards
+
+class Command(BaseCommand):
+    help = 'Build missing product cards and rebuild the ones older than their product'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reconciling product cards...')
+        
+        refreshed, badges = reconcile_product_cards()
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Product cards reconciled: {refreshed} rebuilt, {badges} offer badges changed')
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0019_remove_offer_max_uses_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=64)),
+                ('field', models.CharField(choices=[('name', 'Name'), ('brand', 'Brand'), ('category', 'Category'), ('description', 'Description'), ('specifications', 'Specifications')], max_length=20)),
+                ('term_frequency', models.PositiveIntegerField(default=1)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='store.product')),
+            ],
+            options={
+                'unique_together': {('term', 'product', 'field')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:37
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+def populate_field_length(apps, schema_editor):
+    # A field's length is the sum of the frequencies of its terms
+    SearchIndexEntry = apps.get_model('store', 'SearchIndexEntry')
+    totals = SearchIndexEntry.objects.values('product_id', 'field').annotate(total=Sum('term_frequency'))
+    for row in totals.iterator():
+        SearchIndexEntry.objects.filter(
+            product_id=row['product_id'], field=row['field']
+        ).update(field_length=row['total'])
+
+def reverse_populate_field_length(apps, schema_editor):
+    pass
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0020_searchindexentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchindexentry',
+            name='field_length',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_field_length, reverse_populate_field_length),
+    ]
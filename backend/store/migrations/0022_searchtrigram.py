@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:38
+
+from django.db import migrations, models
+
+def populate_trigrams(apps, schema_editor):
+    # Build trigrams for the name and brand terms already in the search index
+    SearchIndexEntry = apps.get_model('store', 'SearchIndexEntry')
+    SearchTrigram = apps.get_model('store', 'SearchTrigram')
+    terms = SearchIndexEntry.objects.filter(field__in=['name', 'brand']).values_list('term', flat=True).distinct()
+    trigrams = []
+    for term in terms.iterator():
+        padded = f'${term}$'
+        for trigram in {padded[i:i + 3] for i in range(len(padded) - 2)}:
+            trigrams.append(SearchTrigram(trigram=trigram, term=term))
+    SearchTrigram.objects.bulk_create(trigrams, batch_size=1000, ignore_conflicts=True)
+
+def reverse_populate_trigrams(apps, schema_editor):
+    pass
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0021_searchindexentry_field_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(db_index=True, max_length=3)),
+                ('term', models.CharField(max_length=64)),
+            ],
+            options={
+                'unique_together': {('trigram', 'term')},
+            },
+        ),
+        migrations.RunPython(populate_trigrams, reverse_populate_trigrams),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:42
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+def populate_rating_aggregates(apps, schema_editor):
+    # Backfill the stored aggregates from existing reviews
+    Product = apps.get_model('store', 'Product')
+    Review = apps.get_model('store', 'Review')
+    totals = Review.objects.values('product_id').annotate(total=Sum('rating'), count=Count('id'))
+    for row in totals.iterator():
+        Product.objects.filter(id=row['product_id']).update(
+            rating_sum=row['total'] or 0,
+            rating_count=row['count'],
+            average_rating=(row['total'] or 0) / row['count']
+        )
+
+def reverse_populate_rating_aggregates(apps, schema_editor):
+    pass
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0022_searchtrigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='average_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-average_rating', '-rating_count', '-id'], name='store_product_rating_idx'),
+        ),
+        migrations.RunPython(populate_rating_aggregates, reverse_populate_rating_aggregates),
+    ]
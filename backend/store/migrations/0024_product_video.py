@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0023_product_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='video',
+            field=models.FileField(blank=True, upload_to='products/videos/'),
+        ),
+    ]
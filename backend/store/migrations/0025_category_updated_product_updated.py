@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0024_product_video'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:57
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# A copy of store.attribute_index.extract_attributes as it was when this
+# migration was written, so later changes there don't change what it does
+
+QUANTITY_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*([a-z"]+)?')
+UNIT_ALIASES = {'inches': 'inch', 'in': 'inch', '"': 'inch', 'hrs': 'hours', 'hr': 'hours', 'h': 'hours'}
+UNIT_SCALES = {'tb': ('gb', 1024), 'mb': ('gb', 1 / 1024)}
+
+def normalize_key(key):
+    return re.sub(r'[^a-z0-9]+', '_', str(key).lower()).strip('_')[:64]
+
+def normalize_value(value):
+    return ' '.join(str(value).lower().split())[:255]
+
+def parse_quantity(value):
+    if isinstance(value, bool):
+        return None, ''
+    if isinstance(value, (int, float)):
+        return float(value), ''
+    match = QUANTITY_PATTERN.match(str(value).lower())
+    if not match:
+        return None, ''
+    number, unit = float(match.group(1)), UNIT_ALIASES.get(match.group(2) or '', match.group(2) or '')
+    if unit in UNIT_SCALES:
+        unit, scale = UNIT_SCALES[unit]
+        number *= scale
+    return number, unit
+
+def extract_attributes(specifications, prefix=''):
+    if not isinstance(specifications, dict):
+        return []
+    rows = []
+    for raw_key, raw_value in specifications.items():
+        key = normalize_key(f'{prefix}_{raw_key}' if prefix else raw_key)
+        if not key:
+            continue
+        if isinstance(raw_value, dict):
+            rows.extend(extract_attributes(raw_value, prefix=key))
+            continue
+        values = raw_value if isinstance(raw_value, (list, tuple)) else [raw_value]
+        for value in values:
+            if value is None or isinstance(value, (dict, list, tuple)):
+                continue
+            normalized = normalize_value(value)
+            if not normalized:
+                continue
+            number, unit = parse_quantity(value)
+            rows.append((key, normalized, number, unit))
+    return list(dict.fromkeys(rows))
+
+def populate_attributes(apps, schema_editor):
+    # Extract the attribute rows for existing products
+    Product = apps.get_model('store', 'Product')
+    ProductAttribute = apps.get_model('store', 'ProductAttribute')
+    rows = []
+    for product in Product.objects.only('id', 'specifications').iterator(chunk_size=500):
+        for key, value, number, unit in extract_attributes(product.specifications):
+            rows.append(ProductAttribute(product_id=product.id, key=key, value=value, numeric_value=number, unit=unit))
+    ProductAttribute.objects.bulk_create(rows, batch_size=1000)
+
+def reverse_populate_attributes(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0025_category_updated_product_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAttribute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('value', models.CharField(max_length=255)),
+                ('numeric_value', models.FloatField(blank=True, null=True)),
+                ('unit', models.CharField(blank=True, max_length=20)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributes', to='store.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'value'], name='store_produ_key_8f0ad1_idx'), models.Index(fields=['key', 'numeric_value'], name='store_produ_key_59aad9_idx')],
+                'unique_together': {('product', 'key', 'value')},
+            },
+        ),
+        migrations.RunPython(populate_attributes, reverse_populate_attributes),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:01
+
+from django.db import migrations, models
+
+# Starter dictionary, managed from the admin afterwards
+DEFAULT_SYNONYMS = [
+    ('mobile', 'smartphone, smartphones, phone', True),
+    ('tv', 'television, televisions', True),
+    ('laptop', 'notebook', True),
+    ('earphones', 'earbuds, headphones', True),
+    ('ac', 'air conditioner', False),
+    ('fridge', 'refrigerator', True),
+]
+
+def create_default_synonyms(apps, schema_editor):
+    SearchSynonym = apps.get_model('store', 'SearchSynonym')
+    for term, synonyms, two_way in DEFAULT_SYNONYMS:
+        SearchSynonym.objects.get_or_create(term=term, defaults={'synonyms': synonyms, 'two_way': two_way})
+
+def reverse_default_synonyms(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0026_productattribute'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchSynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, unique=True)),
+                ('synonyms', models.TextField(help_text='Comma separated words or phrases')),
+                ('two_way', models.BooleanField(default=True, help_text='Each synonym also expands to the term and the other synonyms; turn off for abbreviations')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['term'],
+            },
+        ),
+        migrations.RunPython(create_default_synonyms, reverse_default_synonyms),
+    ]
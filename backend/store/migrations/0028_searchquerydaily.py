@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:05
+
+from django.db import migrations, models
+
+def rollup_existing_searches(apps, schema_editor):
+    SearchQuery = apps.get_model('store', 'SearchQuery')
+    SearchQueryDaily = apps.get_model('store', 'SearchQueryDaily')
+    totals = {}
+    rows = SearchQuery.objects.values_list('query', 'created_at', 'results_count')
+    for query, created_at, results_count in rows.iterator(chunk_size=2000):
+        query = ' '.join(query.lower().split())[:255]
+        if not query:
+            continue
+        counts = totals.setdefault((query, created_at.date()), [0, 0])
+        counts[0] += 1
+        if not results_count:
+            counts[1] += 1
+    SearchQueryDaily.objects.bulk_create([
+        SearchQueryDaily(query=query, day=day, count=count, zero_result_count=zero_results)
+        for (query, day), (count, zero_results) in totals.items()
+    ], batch_size=1000)
+
+def reverse_rollup_existing_searches(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0027_searchsynonym'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('zero_result_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'query'], name='store_searc_day_352e35_idx')],
+                'unique_together': {('query', 'day')},
+            },
+        ),
+        migrations.RunPython(rollup_existing_searches, reverse_rollup_existing_searches),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:06
+
+from django.db import migrations, models
+
+def count_low_result_searches(apps, schema_editor):
+    # From the raw events still kept - older days stay at zero
+    SearchQuery = apps.get_model('store', 'SearchQuery')
+    SearchQueryDaily = apps.get_model('store', 'SearchQueryDaily')
+    totals = {}
+    rows = SearchQuery.objects.filter(results_count__gte=1, results_count__lte=3).values_list('query', 'created_at')
+    for query, created_at in rows.iterator(chunk_size=2000):
+        key = (' '.join(query.lower().split())[:255], created_at.date())
+        totals[key] = totals.get(key, 0) + 1
+    for (query, day), count in totals.items():
+        SearchQueryDaily.objects.filter(query=query, day=day).update(low_result_count=count)
+
+def reverse_count_low_result_searches(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0028_searchquerydaily'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchquerydaily',
+            name='low_result_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_low_result_searches, reverse_count_low_result_searches),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0029_searchquerydaily_low_result_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base', models.CharField(max_length=50, unique=True)),
+                ('next_suffix', models.PositiveIntegerField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0031_product_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_picture_pending',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='profiles/pending/'),
+        ),
+    ]
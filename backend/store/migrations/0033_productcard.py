@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0032_userprofile_avatars'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCard',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='store.product')),
+                ('slug', models.CharField(max_length=50)),
+                ('name', models.CharField(max_length=200)),
+                ('brand', models.CharField(blank=True, max_length=100)),
+                ('category_slug', models.CharField(blank=True, max_length=50)),
+                ('category_name', models.CharField(blank=True, max_length=100)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('actual_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('discount_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('offer_text', models.CharField(blank=True, max_length=200)),
+                ('exchange_available', models.BooleanField(default=False)),
+                ('exchange_discount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('thumbnail', models.TextField(blank=True)),
+                ('srcset', models.JSONField(blank=True, default=list)),
+                ('average_rating', models.FloatField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('in_stock', models.BooleanField(default=False)),
+                ('available', models.BooleanField(default=True)),
+                ('offer_badge', models.CharField(blank=True, max_length=100)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
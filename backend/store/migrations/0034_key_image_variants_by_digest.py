@@ -0,0 +1,31 @@
+import hashlib
+
+from django.db import migrations
+
+def key_variants_by_digest(apps, schema_editor):
+    # image_variants was keyed by the raw source, which for dashboard uploads is a whole data: URL
+    Product = apps.get_model('store', 'Product')
+    products = []
+    for product in Product.objects.exclude(image_variants={}).only('id', 'image_variants').iterator(chunk_size=500):
+        product.image_variants = {
+            hashlib.sha256(source.encode()).hexdigest()[:16]: derivatives
+            for source, derivatives in product.image_variants.items()
+        }
+        products.append(product)
+    Product.objects.bulk_update(products, ['image_variants'], batch_size=500)
+
+def reverse_key_variants_by_digest(apps, schema_editor):
+    # Derivatives are regenerated under the raw keys by generate_image_derivatives
+    Product = apps.get_model('store', 'Product')
+    Product.objects.update(image_variants={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0033_productcard'),
+    ]
+
+    operations = [
+        migrations.RunPython(key_variants_by_digest, reverse_key_variants_by_digest),
+    ]
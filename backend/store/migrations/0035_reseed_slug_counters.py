@@ -0,0 +1,18 @@
+from django.db import migrations
+
+def reseed_slug_counters(apps, schema_editor):
+    # Counters were seeded from every numeric slug tail; unseeded ones are seeded
+    # again by store.slugs on their next allocation, from suffixes it created
+    SlugCounter = apps.get_model('store', 'SlugCounter')
+    SlugCounter.objects.update(next_suffix=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0034_key_image_variants_by_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(reseed_slug_counters, migrations.RunPython.noop),
+    ]
@@ -4,9 +4,15 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from django.db.models import Count, Avg, Sum, F
+from django.db.models import Count, Sum, F
 from .models import Product, Order, OrderItem, Review, User
-from .serializers import ProductSerializer
+from .serializers import ProductCardSerializer
+from .product_cards import load_cards
+
+def card_data(products):
+    """Card payloads of products by id, from the product card table"""
+    cards = load_cards(product.id for product in products)
+    return {product_id: dict(ProductCardSerializer(card).data) for product_id, card in cards.items()}
 
 class ProductRecommender:
     """ML-based product recommendation system using real database data"""
@@ -22,9 +28,13 @@ class ProductRecommender:
                 total_orders__gt=0
             ).order_by('-total_orders', '-total_quantity')[:limit]
             
+            most_ordered = list(most_ordered)
+            cards = card_data(most_ordered)
             products_data = []
             for product in most_ordered:
-                product_data = ProductSerializer(product).data
+                if product.id not in cards:
+                    continue
+                product_data = cards[product.id]
                 product_data['total_orders'] = product.total_orders
                 product_data['total_quantity'] = product.total_quantity or 0
                 products_data.append(product_data)
@@ -38,18 +48,20 @@ class ProductRecommender:
     def get_most_popular_products(limit=6):
         """Get most popular products based on reviews and ratings"""
         try:
-            most_popular = Product.objects.annotate(
-                review_count=Count('reviews'),
-                average_rating=Avg('reviews__rating'),
-                popularity_score=Count('reviews') * Avg('reviews__rating')
-            ).filter(
-                review_count__gt=0
-            ).order_by('-popularity_score', '-review_count')[:limit]
-            
+            most_popular = Product.objects.filter(
+                rating_count__gt=0
+            ).annotate(
+                popularity_score=F('rating_count') * F('average_rating')
+            ).select_related('category').order_by('-popularity_score', '-rating_count')[:limit]
+            
+            most_popular = list(most_popular)
+            cards = card_data(most_popular)
             products_data = []
             for product in most_popular:
-                product_data = ProductSerializer(product).data
-                product_data['review_count'] = product.review_count
+                if product.id not in cards:
+                    continue
+                product_data = cards[product.id]
+                product_data['review_count'] = product.rating_count
                 product_data['average_rating'] = round(product.average_rating, 1) if product.average_rating else 0
                 product_data['popularity_score'] = round(product.popularity_score, 2) if product.popularity_score else 0
                 products_data.append(product_data)
@@ -65,10 +77,8 @@ class ProductRecommender:
         try:
             # Get products with their features
             products = Product.objects.annotate(
-                avg_rating=Avg('reviews__rating'),
-                order_count=Count('orderitem'),
-                review_count=Count('reviews')
-            ).all()
+                order_count=Count('orderitem')
+            ).select_related('category')
             
             if len(products) < limit:
                 return []
@@ -80,9 +90,9 @@ class ProductRecommender:
             for product in product_list:
                 feature_vector = [
                     float(product.price) / 1000,  # Normalize price
-                    product.avg_rating or 0,
+                    product.average_rating,
                     product.order_count or 0,
-                    product.review_count or 0,
+                    product.rating_count,
                     len(product.name) / 100,  # Name length feature
                     1 if product.available else 0
                 ]
@@ -94,7 +104,7 @@ class ProductRecommender:
             # Create target labels (popular = 1, not popular = 0)
             y = []
             for product in product_list:
-                popularity = (product.order_count or 0) + (product.review_count or 0) * 2
+                popularity = (product.order_count or 0) + product.rating_count * 2
                 y.append(1 if popularity > 5 else 0)
             
             y = np.array(y)
@@ -118,14 +128,21 @@ class ProductRecommender:
             for i, product in enumerate(product_list):
                 if len(probabilities[i]) > 1:
                     confidence = probabilities[i][1]  # Probability of being popular
-                    product_data = ProductSerializer(product).data
-                    product_data['ml_score'] = round(max(0.75, min(0.95, confidence)), 2)
-                    product_data['algorithm'] = 'K-Nearest Neighbors'
-                    recommendations.append((product_data, confidence))
+                    recommendations.append((product, confidence))
             
             # Sort by confidence and return top recommendations
             recommendations.sort(key=lambda x: x[1], reverse=True)
-            return [rec[0] for rec in recommendations[:limit]]
+            recommendations = recommendations[:limit]
+            cards = card_data([product for product, _ in recommendations])
+            results = []
+            for product, confidence in recommendations:
+                if product.id not in cards:
+                    continue
+                product_data = cards[product.id]
+                product_data['ml_score'] = round(max(0.75, min(0.95, confidence)), 2)
+                product_data['algorithm'] = 'K-Nearest Neighbors'
+                results.append(product_data)
+            return results
             
         except Exception as e:
             print(f"KNN error: {e}")
@@ -135,8 +152,11 @@ class ProductRecommender:
     def _fallback_knn_recommendations(products, limit):
         """Fallback KNN recommendations when ML fails"""
         recommendations = []
+        cards = card_data(products[:limit])
         for i, product in enumerate(products[:limit]):
-            product_data = ProductSerializer(product).data
+            if product.id not in cards:
+                continue
+            product_data = cards[product.id]
             product_data['ml_score'] = round(0.95 - (i * 0.03), 2)
             product_data['algorithm'] = 'K-Nearest Neighbors'
             recommendations.append(product_data)
@@ -157,7 +177,8 @@ class ProductRecommender:
             print(f"All recommendations error: {e}")
             # Ultimate fallback
             products = list(Product.objects.all()[:6])
-            fallback_data = [ProductSerializer(p).data for p in products]
+            cards = card_data(products)
+            fallback_data = [cards[p.id] for p in products if p.id in cards]
             return {
                 'most_ordered': fallback_data,
                 'most_popular': fallback_data,
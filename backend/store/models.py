@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -11,6 +12,9 @@ class UserProfile(models.Model):
     pincode = models.CharField(max_length=10, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    # Raw upload waiting for store/avatars.py to turn it into the avatar sizes below
+    profile_picture_pending = models.FileField(upload_to='profiles/pending/', blank=True, null=True, editable=False)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)  # Avatar size -> file name
     
     def __str__(self):
         return f"{self.user.username}'s Profile"
@@ -19,6 +23,7 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
     icon = models.CharField(max_length=50, default='fas fa-microchip')
+    updated = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -43,24 +48,49 @@ class Product(models.Model):
     image = models.ImageField(upload_to='products/', blank=True, null=True)
     image_url = models.URLField(blank=True, null=True)
     image_urls = models.JSONField(default=list, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)  # Source image digest -> derivative files, from store/image_pipeline.py
     video_url = models.URLField(blank=True, null=True)
-    video_file = models.TextField(blank=True, null=True)  # Base64 encoded video
+    video = models.FileField(upload_to='products/videos/', blank=True)
+    video_file = models.TextField(blank=True, null=True)  # Legacy base64 video, moved to `video` by migrate_product_videos
     stock = models.IntegerField(default=10)
     available = models.BooleanField(default=True)
     warranty_months = models.IntegerField(default=12)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    
+    # Review aggregates, kept in sync by review signals
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-average_rating', '-rating_count', '-id'], name='store_product_rating_idx'),
+        ]
     
     def __str__(self):
         return self.name
     
     def get_average_rating(self):
-        reviews = self.reviews.all()
-        if reviews:
-            return sum([review.rating for review in reviews]) / len(reviews)
-        return 0
+        return self.average_rating
     
     def get_review_count(self):
-        return self.reviews.count()
+        return self.rating_count
+    
+    def update_rating_aggregates(self):
+        """Recompute the stored review aggregates from the reviews table"""
+        totals = self.reviews.aggregate(total=models.Sum('rating'), count=models.Count('id'))
+        self.rating_sum = totals['total'] or 0
+        self.rating_count = totals['count']
+        self.average_rating = self.rating_sum / self.rating_count if self.rating_count else 0
+        # Queryset update so saving aggregates doesn't trigger product save signals
+        self.updated = timezone.now()
+        Product.objects.filter(id=self.id).update(
+            rating_sum=self.rating_sum,
+            rating_count=self.rating_count,
+            average_rating=self.average_rating,
+            updated=self.updated
+        )
     
     def get_discounted_price(self):
         return float(self.price)
@@ -525,4 +555,124 @@ class SearchQuery(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.query} ({self.results_count} results)"
\ No newline at end of file
+        return f"{self.query} ({self.results_count} results)"
+
+class SearchQueryDaily(models.Model):
+    """Searches per normalized query and day, rolled up from SearchQuery as events are written"""
+    query = models.CharField(max_length=255)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    zero_result_count = models.PositiveIntegerField(default=0)
+    low_result_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ('query', 'day')
+        indexes = [
+            models.Index(fields=['day', 'query']),
+        ]
+    
+    def __str__(self):
+        return f"{self.query} on {self.day} ({self.count} searches)"
+
+class SearchIndexEntry(models.Model):
+    FIELD_CHOICES = [
+        ('name', 'Name'),
+        ('brand', 'Brand'),
+        ('category', 'Category'),
+        ('description', 'Description'),
+        ('specifications', 'Specifications'),
+    ]
+    
+    # One row per (term, product, field) - the posting list for a search term
+    term = models.CharField(max_length=64, db_index=True)
+    product = models.ForeignKey(Product, related_name='search_entries', on_delete=models.CASCADE)
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    term_frequency = models.PositiveIntegerField(default=1)
+    field_length = models.PositiveIntegerField(default=0)  # Terms in this field of the product, for BM25
+    
+    class Meta:
+        unique_together = ('term', 'product', 'field')
+    
+    def __str__(self):
+        return f"{self.term} -> {self.product_id} ({self.field})"
+
+class SearchTrigram(models.Model):
+    # Character trigrams of product name and brand terms, for typo-tolerant search
+    trigram = models.CharField(max_length=3, db_index=True)
+    term = models.CharField(max_length=64)
+    
+    class Meta:
+        unique_together = ('trigram', 'term')
+    
+    def __str__(self):
+        return f"{self.trigram} -> {self.term}"
+
+class ProductAttribute(models.Model):
+    # Extracted specifications, for structured spec filters
+    product = models.ForeignKey(Product, related_name='attributes', on_delete=models.CASCADE)
+    key = models.CharField(max_length=64)  # Normalized: "Display Size" -> display_size
+    value = models.CharField(max_length=255)  # Lowercased, whitespace collapsed
+    numeric_value = models.FloatField(null=True, blank=True)  # Leading number: "8 GB" -> 8
+    unit = models.CharField(max_length=20, blank=True)  # Unit after the number: "8 GB" -> gb
+    
+    class Meta:
+        unique_together = ('product', 'key', 'value')
+        indexes = [
+            models.Index(fields=['key', 'value']),
+            models.Index(fields=['key', 'numeric_value']),
+        ]
+    
+    def __str__(self):
+        return f"{self.key}={self.value} ({self.product_id})"
+
+class SearchSynonym(models.Model):
+    """Search dictionary entry - a query containing `term` also searches for its synonyms"""
+    term = models.CharField(max_length=100, unique=True)
+    synonyms = models.TextField(help_text='Comma separated words or phrases')
+    two_way = models.BooleanField(default=True, help_text='Each synonym also expands to the term and the other synonyms; turn off for abbreviations')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['term']
+    
+    def get_synonyms(self):
+        return [synonym.strip() for synonym in self.synonyms.split(',') if synonym.strip()]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.synonyms}"
+
+class SlugCounter(models.Model):
+    """Next free numeric suffix for product slugs sharing a base, e.g. iphone-15 -> iphone-15-3"""
+    base = models.CharField(max_length=50, unique=True)
+    next_suffix = models.PositiveIntegerField(null=True)  # 0: the bare base is still free, None: not seeded yet
+    
+    def __str__(self):
+        return f"{self.base} -> {self.next_suffix}"
+
+class ProductCard(models.Model):
+    """Denormalized list row of a product - kept in sync by store/product_cards.py"""
+    product = models.OneToOneField(Product, primary_key=True, related_name='card', on_delete=models.CASCADE)
+    slug = models.CharField(max_length=50)
+    name = models.CharField(max_length=200)
+    brand = models.CharField(max_length=100, blank=True)
+    category_slug = models.CharField(max_length=50, blank=True)
+    category_name = models.CharField(max_length=100, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    actual_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    discount_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    offer_text = models.CharField(max_length=200, blank=True)
+    exchange_available = models.BooleanField(default=False)
+    exchange_discount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    thumbnail = models.TextField(blank=True)  # Card-size derivative path, else the original image URL
+    srcset = models.JSONField(default=list, blank=True)  # [[derivative path, width], ...]
+    average_rating = models.FloatField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    in_stock = models.BooleanField(default=False)
+    available = models.BooleanField(default=True)
+    offer_badge = models.CharField(max_length=100, blank=True)  # Best valid offer for the product
+    refreshed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Card: {self.name}"
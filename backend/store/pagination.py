@@ -0,0 +1,191 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_VALUE_TYPES = (str, int, float)
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the full sort key of the queryset.
+
+    The cursor holds the sort values of the last row served, so the next
+    page is a range scan from there - deep pages cost the same as the first.
+    Views that rank results in Python set `view.ranking` to ordered
+    (id, score) pairs instead, and views that filter in memory set
+    `view.matches`; either way only the page is loaded from the database.
+    """
+    page_size = 12
+    max_page_size = 100
+    page_size_query_params = ('page_size', 'limit')
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        for param in self.page_size_query_params:
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    return max(1, min(int(value), self.max_page_size))
+                except ValueError:
+                    pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        ranking = getattr(view, 'ranking', None)
+        if ranking is not None:
+            return self.paginate_ranking(queryset, ranking, cursor)
+
+        ordering = self.get_ordering(queryset)
+        matches = getattr(view, 'matches', None)
+        if matches is not None and matches.ordering == ordering:
+            page = self.paginate_matches(queryset, matches, cursor)
+            if page is not None:
+                return page
+
+        if cursor:
+            if cursor['ordering'] != ordering or len(cursor['values']) != len(ordering):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                queryset = queryset.filter(self.after_condition(ordering, cursor['values']))
+            except (TypeError, ValueError, DjangoValidationError):
+                # Values of the wrong type for their column
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        page = results[:self.page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = page[-1]
+            values = [self.to_json(getattr(last, field.lstrip('-'))) for field in ordering]
+            self.next_cursor = self.encode_cursor({'ordering': ordering, 'values': values})
+        return page
+
+    def paginate_matches(self, queryset, matches, cursor):
+        """
+        Page of ids already filtered and sorted in memory. Cursors are the
+        same as for the queryset; None when the cursor's row is no longer
+        among the matches, so the caller falls back to the range scan.
+        """
+        start = 0
+        if cursor:
+            if cursor['ordering'] != matches.ordering or len(cursor['values']) != len(matches.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            start = matches.position_after(cursor['values'][-1])
+            if start is None:
+                return None
+
+        ids = [int(product_id) for product_id in matches.ids[start:start + self.page_size]]
+        self.has_next = len(matches) > start + self.page_size
+
+        objects = queryset.in_bulk(ids)
+        page = [objects[product_id] for product_id in ids if product_id in objects]
+
+        self.next_cursor = None
+        if self.has_next and page:
+            last = page[-1]
+            values = [self.to_json(getattr(last, field.lstrip('-'))) for field in matches.ordering]
+            self.next_cursor = self.encode_cursor({'ordering': matches.ordering, 'values': values})
+        return page
+
+    def paginate_ranking(self, queryset, ranking, cursor):
+        ordering = ['-relevance', 'id']
+        if cursor:
+            if cursor['ordering'] != ordering or len(cursor['values']) != 2:
+                raise NotFound(self.invalid_cursor_message)
+            last_score, last_id = cursor['values']
+            if isinstance(last_score, str) or not isinstance(last_id, int):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                ranking = [
+                    (product_id, score) for product_id, score in ranking
+                    if score < last_score or (score == last_score and product_id > last_id)
+                ]
+            except TypeError:
+                raise NotFound(self.invalid_cursor_message)
+
+        self.has_next = len(ranking) > self.page_size
+        ranking = ranking[:self.page_size]
+
+        objects = queryset.in_bulk([product_id for product_id, _ in ranking])
+        page = [objects[product_id] for product_id, _ in ranking if product_id in objects]
+
+        self.next_cursor = None
+        if self.has_next:
+            last_id, last_score = ranking[-1]
+            self.next_cursor = self.encode_cursor({'ordering': ordering, 'values': [last_score, last_id]})
+        return page
+
+    def get_ordering(self, queryset):
+        ordering = [str(field) for field in queryset.query.order_by]
+        if not ordering or not all(isinstance(field, str) for field in queryset.query.order_by):
+            raise ValueError('KeysetPagination requires a queryset ordered by field names')
+        # Rows need a unique tie-breaker so no row is skipped or repeated
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('id')
+        return ordering
+
+    def after_condition(self, ordering, values):
+        """Rows strictly after the given sort values, as a Q object"""
+        condition = Q()
+        for index in reversed(range(len(ordering))):
+            field = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{field}__{lookup}': values[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{field: values[index]}) & condition
+            condition = step
+        return condition
+
+    def to_json(self, value):
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def encode_cursor(self, data):
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(data, dict) or 'ordering' not in data or 'values' not in data:
+                raise ValueError
+            if not isinstance(data['ordering'], list) or not all(isinstance(field, str) for field in data['ordering']):
+                raise ValueError
+            # Sort values are JSON scalars; None can't be used in the range condition
+            if not isinstance(data['values'], list) or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in data['values']):
+                raise ValueError
+            return data
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'page_size': self.page_size,
+            'results': data
+        })
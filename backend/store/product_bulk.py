@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.utils import timezone
+from .autocomplete import suggestion_index
+from .catalog_cache import bump_catalog_version
+from .models import Product
+from .product_cards import refresh_product_cards
+from .product_import import clean_row
+
+# Fields a bulk update may change. None of them are in the search or attribute
+# indexes, so only the suggestions (which skip unavailable products) need refreshing.
+BULK_UPDATE_FIELDS = (
+    'price', 'actual_price', 'discount_percentage', 'offer_text',
+    'exchange_available', 'exchange_discount', 'stock', 'available',
+)
+NON_NEGATIVE_FIELDS = ('price', 'actual_price', 'discount_percentage', 'exchange_discount', 'stock')
+MAX_BULK_UPDATE_ROWS = 1000
+
+def _row_id(row):
+    try:
+        return int(row.get('id'))
+    except (TypeError, ValueError):
+        return None
+
+def _row_errors(data, errors):
+    for field in NON_NEGATIVE_FIELDS:
+        if data.get(field) is not None and data[field] < 0:
+            errors[field] = ['Ensure this value is greater than or equal to 0.']
+    if not data and not errors:
+        errors['row'] = [f"No fields to update, expected any of: {', '.join(BULK_UPDATE_FIELDS)}"]
+    return errors
+
+def bulk_update_products(rows):
+    """
+    Apply a list of {id, <field>: <value>, ...} changes with one bulk_update in
+    one transaction. Every field given is applied; null clears a nullable one
+    such as actual_price. Invalid rows are reported and skipped, the others applied.
+    Returns the summary and a report entry per row.
+    """
+    reports = [None] * len(rows)
+    changes = {}
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            reports[index] = {'index': index, 'status': 'error', 'errors': {'row': ['Each change must be an object']}}
+            continue
+        product_id = _row_id(row)
+        if product_id is None:
+            reports[index] = {'index': index, 'status': 'error', 'errors': {'id': ['A product id is required.']}}
+            continue
+        if product_id in changes:
+            reports[index] = {'index': index, 'id': product_id, 'status': 'error', 'errors': {'id': ['Duplicate product in this request']}}
+            continue
+        # Every field given is applied, null clears actual_price
+        data, errors = clean_row(row, BULK_UPDATE_FIELDS, explicit=True)
+        errors = _row_errors(data, errors)
+        if errors:
+            reports[index] = {'index': index, 'id': product_id, 'status': 'error', 'errors': errors}
+            continue
+        changes[product_id] = (index, data)
+
+    updated = []
+    if changes:
+        now = timezone.now()
+        fields = set()
+        with transaction.atomic():
+            products = Product.objects.select_for_update().only('id', 'name', 'brand', *BULK_UPDATE_FIELDS).in_bulk(list(changes))
+            for product_id, (index, data) in changes.items():
+                product = products.get(product_id)
+                if product is None:
+                    reports[index] = {'index': index, 'id': product_id, 'status': 'error', 'errors': {'id': ['Product not found']}}
+                    continue
+                for field, value in data.items():
+                    setattr(product, field, value)
+                # bulk_update skips auto_now
+                product.updated = now
+                fields.update(data)
+                updated.append(product)
+                reports[index] = {'index': index, 'id': product_id, 'status': 'updated'}
+            if updated:
+                Product.objects.bulk_update(updated, sorted(fields | {'updated'}), batch_size=500)
+
+    if updated:
+        # bulk_update sends no signals, so the caches are refreshed here, once
+        refresh_product_cards([product.id for product in updated])
+        if 'available' in fields:
+            for product in updated:
+                suggestion_index.update_product(product)
+        bump_catalog_version()
+
+    summary = {
+        'rows': len(rows),
+        'updated': len(updated),
+        'errors': len(rows) - len(updated),
+    }
+    return summary, reports
@@ -0,0 +1,213 @@
+import threading
+import time
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.urls import reverse
+from django.utils import timezone
+from .catalog_cache import bump_catalog_version
+from .image_pipeline import DERIVATIVE_SIZES, primary_source, source_derivatives
+from .models import Offer, Product, ProductCard
+
+# Product columns a card is built from
+CARD_SOURCE_COLUMNS = (
+    'id', 'slug', 'name', 'brand', 'category', 'price', 'actual_price', 'discount_percentage',
+    'offer_text', 'exchange_available', 'exchange_discount', 'image', 'image_url', 'image_urls',
+    'image_variants', 'stock', 'available', 'average_rating', 'rating_count',
+)
+CARD_FIELDS = [
+    field.name for field in ProductCard._meta.concrete_fields if not field.primary_key
+]
+CARD_BATCH_SIZE = 500
+
+# Cards are checked against their products this often, for changes made without signals
+RECONCILE_INTERVAL = 300
+
+OFFER_PRIORITIES = {'low': 0, 'medium': 1, 'high': 2}
+
+def _batches(items, size=CARD_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def offer_badges(product_ids=None):
+    """
+    Badge of the best valid offer of each product - highest priority, then
+    newest - from offers on the product or on its category. {product_id: text}
+    """
+    now = timezone.now()
+    offers = {
+        offer.id: offer for offer in Offer.objects.filter(is_active=True, start_date__lte=now, end_date__gte=now)
+    }
+    if not offers:
+        return {}
+
+    targets = []
+    direct = Offer.products.through.objects.filter(offer_id__in=offers)
+    if product_ids is not None:
+        direct = direct.filter(product_id__in=product_ids)
+    targets.extend(direct.values_list('product_id', 'offer_id'))
+
+    category_offers = {}
+    for category_id, offer_id in Offer.categories.through.objects.filter(offer_id__in=offers).values_list('category_id', 'offer_id'):
+        category_offers.setdefault(category_id, []).append(offer_id)
+    if category_offers:
+        products = Product.objects.filter(category_id__in=category_offers)
+        if product_ids is not None:
+            products = products.filter(id__in=product_ids)
+        for product_id, category_id in products.values_list('id', 'category_id'):
+            targets.extend((product_id, offer_id) for offer_id in category_offers[category_id])
+
+    def rank(offer):
+        return OFFER_PRIORITIES.get(offer.priority, 0), offer.created_at, offer.id
+
+    best = {}
+    for product_id, offer_id in targets:
+        offer = offers[offer_id]
+        if product_id not in best or rank(offer) > rank(best[product_id]):
+            best[product_id] = offer
+    return {product_id: offer.get_badge_text()[:100] for product_id, offer in best.items()}
+
+def _image_path(name):
+    return reverse('product-image', args=[name.rsplit('/', 1)[-1]])
+
+def card_images(product):
+    """Card thumbnail and srcset pairs of a product's card image"""
+    source = primary_source(product)
+    if not source:
+        return '', []
+    derivatives = source_derivatives(product, source)
+    if not derivatives:
+        if source.startswith(('http://', 'https://', 'data:')):
+            return source, []
+        return default_storage.url(source), []
+
+    widths = {}
+    for size in DERIVATIVE_SIZES:
+        if size in derivatives:
+            widths.setdefault(derivatives[size]['width'], _image_path(derivatives[size]['name']))
+    return _image_path(derivatives['card']['name']), [[path, width] for width, path in sorted(widths.items())]
+
+def build_card(product, badge='', now=None):
+    thumbnail, srcset = card_images(product)
+    return ProductCard(
+        product_id=product.id,
+        slug=product.slug,
+        name=product.name,
+        brand=product.brand,
+        category_slug=product.category.slug if product.category else '',
+        category_name=product.category.name if product.category else '',
+        price=product.price,
+        actual_price=product.actual_price,
+        discount_percentage=product.discount_percentage,
+        offer_text=product.offer_text,
+        exchange_available=product.exchange_available,
+        exchange_discount=product.exchange_discount,
+        thumbnail=thumbnail,
+        srcset=srcset,
+        average_rating=product.average_rating,
+        review_count=product.rating_count,
+        in_stock=product.stock > 0,
+        available=product.available,
+        offer_badge=badge,
+        refreshed_at=now or timezone.now(),
+    )
+
+def refresh_product_cards(product_ids):
+    """Rebuild the cards of the given products from them, returns how many were written"""
+    written = 0
+    for batch in _batches(set(product_ids)):
+        now = timezone.now()
+        products = Product.objects.filter(id__in=batch).select_related('category').only(
+            *CARD_SOURCE_COLUMNS, 'category__slug', 'category__name'
+        )
+        badges = offer_badges(batch)
+        cards = [build_card(product, badges.get(product.id, ''), now) for product in products]
+        ProductCard.objects.bulk_create(
+            cards, update_conflicts=True, unique_fields=['product'], update_fields=CARD_FIELDS
+        )
+        written += len(cards)
+    return written
+
+def refresh_offer_badges():
+    """Move every card's offer badge to its current best offer, returns how many changed"""
+    badges = offer_badges()
+    changed = ProductCard.objects.exclude(offer_badge='').exclude(product_id__in=list(badges)).update(offer_badge='')
+
+    by_badge = {}
+    for product_id, badge in badges.items():
+        by_badge.setdefault(badge, []).append(product_id)
+    for badge, product_ids in by_badge.items():
+        for batch in _batches(product_ids):
+            changed += ProductCard.objects.filter(product_id__in=batch).exclude(offer_badge=badge).update(offer_badge=badge)
+    return changed
+
+def _after_commit(refresh):
+    def run():
+        refresh()
+        # The version moved when the write was made, before the commit; a list
+        # cached since then was built from the old cards
+        bump_catalog_version()
+    transaction.on_commit(run)
+
+def refresh_product_cards_on_commit(product_ids):
+    """Rebuild the cards once the current transaction commits, so they read the committed products"""
+    product_ids = list(product_ids)
+    _after_commit(lambda: refresh_product_cards(product_ids))
+
+def refresh_offer_badges_on_commit():
+    _after_commit(refresh_offer_badges)
+
+def load_cards(product_ids):
+    """Cards of the given products by id, building any that are missing"""
+    product_ids = list(product_ids)
+    cards = ProductCard.objects.in_bulk(product_ids)
+    missing = [product_id for product_id in product_ids if product_id not in cards]
+    if missing:
+        refresh_product_cards(missing)
+        cards.update(ProductCard.objects.in_bulk(missing))
+    return cards
+
+def card_page(products):
+    """Cards in the order of a page of products"""
+    cards = load_cards(product.id for product in products)
+    return [cards[product.id] for product in products if product.id in cards]
+
+def reconcile_product_cards():
+    """
+    Bring every card up to date: build missing ones and rebuild those older
+    than their product (bulk writes and queryset updates send no signals),
+    then recompute offer badges, which change as offers start and end.
+    """
+    stale = Product.objects.filter(Q(card__isnull=True) | Q(updated__gt=F('card__refreshed_at'))).values_list('id', flat=True)
+    refreshed = refresh_product_cards(list(stale))
+    badges = refresh_offer_badges()
+    if refreshed or badges:
+        bump_catalog_version()
+    return refreshed, badges
+
+class CardReconciler:
+    """Per-worker background thread running reconcile_product_cards every RECONCILE_INTERVAL seconds"""
+
+    def __init__(self, interval=RECONCILE_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                reconcile_product_cards()
+            except Exception as e:
+                print(f"Product card reconcile error: {e}")
+            finally:
+                connections.close_all()
+
+card_reconciler = CardReconciler()
@@ -0,0 +1,187 @@
+import csv
+import json
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+# Exported column -> values() lookup. The columns match the import's, so an
+# export can be edited and imported back; videos are never exported.
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'slug': 'slug',
+    'category': 'category__slug',
+    'brand': 'brand',
+    'model_number': 'model_number',
+    'description': 'description',
+    'specifications': 'specifications',
+    'price': 'price',
+    'actual_price': 'actual_price',
+    'discount_percentage': 'discount_percentage',
+    'offer_text': 'offer_text',
+    'exchange_available': 'exchange_available',
+    'exchange_discount': 'exchange_discount',
+    'image_url': 'image_url',
+    'image_urls': 'image_urls',
+    'video_url': 'video_url',
+    'stock': 'stock',
+    'available': 'available',
+    'warranty_months': 'warranty_months',
+    'average_rating': 'average_rating',
+    'rating_count': 'rating_count',
+    'created': 'created',
+    'updated': 'updated',
+}
+JSON_COLUMNS = ('specifications', 'image_urls')
+
+def export_columns(param):
+    """Columns picked by a comma separated `columns` param, all of them by default"""
+    if not param:
+        return list(EXPORT_COLUMNS)
+    columns = list(dict.fromkeys(column.strip() for column in param.split(',') if column.strip()))
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+    return columns
+
+def export_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Value tuples of the queryset, read in chunks (a server-side cursor where supported)"""
+    lookups = [EXPORT_COLUMNS[column] for column in columns]
+    return queryset.order_by('id').values_list(*lookups).iterator(chunk_size=chunk_size)
+
+def _batches(rows, size=EXPORT_CHUNK_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class _Lines:
+    """Write target for csv.writer that hands back each formatted line"""
+
+    def write(self, value):
+        return value
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def stream_csv(rows, columns):
+    writer = csv.writer(_Lines())
+    yield writer.writerow(columns)
+    for batch in _batches(rows):
+        yield ''.join(writer.writerow([_csv_value(value) for value in row]) for row in batch)
+
+def stream_jsonl(rows, columns):
+    encoder = DjangoJSONEncoder()
+    for batch in _batches(rows):
+        yield ''.join(encoder.encode(dict(zip(columns, row))) + '\n' for row in batch)
+
+class _ParquetSink:
+    """File-like target for the Parquet writer whose output is drained after every row group"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _parquet_schema(pa, columns):
+    from .models import Product
+    types = {
+        'category': pa.string(),
+        'specifications': pa.string(),
+        'image_urls': pa.string(),
+    }
+    schema = []
+    for column in columns:
+        if column not in types:
+            field = Product._meta.get_field(column)
+            kind = field.get_internal_type()
+            if kind in ('AutoField', 'BigAutoField', 'IntegerField', 'PositiveIntegerField'):
+                types[column] = pa.int64()
+            elif kind == 'DecimalField':
+                types[column] = pa.decimal128(field.max_digits, field.decimal_places)
+            elif kind == 'FloatField':
+                types[column] = pa.float64()
+            elif kind == 'BooleanField':
+                types[column] = pa.bool_()
+            elif kind == 'DateTimeField':
+                types[column] = pa.timestamp('us')
+            else:
+                types[column] = pa.string()
+        schema.append((column, types[column]))
+    return pa.schema(schema)
+
+def stream_parquet(rows, columns):
+    """One Parquet row group per chunk, yielded as soon as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa, columns)
+    json_positions = [index for index, column in enumerate(columns) if column in JSON_COLUMNS]
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in _batches(rows):
+            values = list(zip(*batch))
+            for index in json_positions:
+                values[index] = [json.dumps(value) for value in values[index]]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(index).type) for index, column in enumerate(values)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def stream_export(rows, columns, fmt):
+    if fmt == 'csv':
+        return stream_csv(rows, columns)
+    if fmt == 'jsonl':
+        return stream_jsonl(rows, columns)
+    return stream_parquet(rows, columns)
@@ -0,0 +1,175 @@
+import math
+from django.db.models import Case, Count, IntegerField, Max, Min, Q, Value, When
+from rest_framework.exceptions import ValidationError
+from .models import Product
+from .search_index import matching_products
+from .attribute_index import apply_spec_filters
+
+# Lower bounds of the price facet buckets, in rupees
+PRICE_BUCKETS = [0, 1000, 5000, 10000, 25000, 50000, 100000]
+
+# Filters that are also facets - each facet's counts ignore its own selection,
+# so picking one brand still shows how many products the other brands have
+FACET_FILTERS = ('category', 'brand', 'in_stock')
+
+# Product list sorts - id breaks ties so cursor pagination is stable
+SORT_ORDERINGS = {
+    'price_low': ('price', 'id'),
+    'price_high': ('-price', 'id'),
+    'newest': ('-created', '-id'),
+    'rating': ('-average_rating', '-rating_count', '-id'),
+    'name': ('name', 'id'),
+}
+
+def get_sort_ordering(sort_by):
+    return SORT_ORDERINGS.get(sort_by, SORT_ORDERINGS['name'])
+
+def has_search(params):
+    search = params.get('search')
+    return bool(search and search.strip())
+
+def apply_product_filters(queryset, params, skip=()):
+    """Apply the product list query params to `queryset`, except the filters named in `skip`"""
+    category_slug = params.get('category')
+    search = params.get('search')
+    min_price = params.get('min_price')
+    max_price = params.get('max_price')
+    brand = params.get('brand')
+    min_rating = params.get('min_rating')
+    in_stock = params.get('in_stock')
+
+    # Category filter
+    if category_slug and 'category' not in skip:
+        queryset = queryset.filter(
+            Q(category__slug=category_slug) |
+            Q(category__name__icontains=category_slug.replace('-', ' '))
+        )
+
+    # Enhanced search - answered from the inverted index
+    if has_search(params):
+        queryset = queryset.filter(id__in=matching_products(search))
+
+    # Price range filter
+    if min_price:
+        queryset = queryset.filter(price__gte=min_price)
+    if max_price:
+        queryset = queryset.filter(price__lte=max_price)
+
+    # Brand filter
+    if brand and 'brand' not in skip:
+        brands = brand.split(',')
+        queryset = queryset.filter(brand__in=brands)
+
+    # Rating filter
+    if min_rating:
+        try:
+            rating = float(min_rating)
+        except ValueError:
+            rating = None
+        if rating is None or not math.isfinite(rating):
+            raise ValidationError({'min_rating': 'A number is required.'})
+        queryset = queryset.filter(average_rating__gte=rating)
+
+    # Specification filters - spec.<key>[__gte|__gt|__lte|__lt]=<value>
+    queryset = apply_spec_filters(queryset, params)
+    
+    # Stock filter
+    if 'in_stock' not in skip:
+        if in_stock == 'true':
+            queryset = queryset.filter(stock__gt=0)
+        elif in_stock == 'false':
+            queryset = queryset.filter(stock=0)
+
+    return queryset
+
+def _price_bucket():
+    whens = [
+        When(price__lt=upper, then=Value(index))
+        for index, upper in enumerate(PRICE_BUCKETS[1:])
+    ]
+    return Case(*whens, default=Value(len(PRICE_BUCKETS) - 1), output_field=IntegerField())
+
+def _matches(row, params, skip):
+    """Python twin of the facet filters in apply_product_filters, for one grouped row"""
+    category_slug = params.get('category')
+    if category_slug and 'category' not in skip:
+        name = (row['category__name'] or '').lower()
+        if row['category__slug'] != category_slug and category_slug.replace('-', ' ').lower() not in name:
+            return False
+
+    brand = params.get('brand')
+    if brand and 'brand' not in skip and row['brand'] not in brand.split(','):
+        return False
+
+    in_stock = params.get('in_stock')
+    if 'in_stock' not in skip:
+        if in_stock == 'true' and not row['in_stock']:
+            return False
+        if in_stock == 'false' and row['in_stock']:
+            return False
+    return True
+
+def compute_facets(params):
+    """
+    Facet counts for the product list filter set, from a single grouped query.
+    Rows are grouped by every facet value at once over the non-facet filters,
+    then each facet is counted from those rows with the other facets' filters.
+    """
+    queryset = apply_product_filters(Product.objects.filter(available=True), params, skip=FACET_FILTERS)
+    rows = list(
+        queryset.annotate(
+            price_bucket=_price_bucket(),
+            in_stock=Case(When(stock__gt=0, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ).values(
+            'brand', 'category__slug', 'category__name', 'price_bucket', 'in_stock'
+        ).annotate(
+            count=Count('id'), min_price=Min('price'), max_price=Max('price')
+        ).order_by()
+    )
+
+    brands = {}
+    categories = {}
+    buckets = [0] * len(PRICE_BUCKETS)
+    stock = {'in_stock': 0, 'out_of_stock': 0}
+    total = 0
+    min_price = max_price = None
+
+    for row in rows:
+        count = row['count']
+        if row['brand'] and _matches(row, params, skip=('brand',)):
+            brands[row['brand']] = brands.get(row['brand'], 0) + count
+        if row['category__slug'] and _matches(row, params, skip=('category',)):
+            key = (row['category__slug'], row['category__name'])
+            categories[key] = categories.get(key, 0) + count
+        if _matches(row, params, skip=('in_stock',)):
+            stock['in_stock' if row['in_stock'] else 'out_of_stock'] += count
+        if _matches(row, params, skip=()):
+            buckets[row['price_bucket']] += count
+            total += count
+            min_price = row['min_price'] if min_price is None else min(min_price, row['min_price'])
+            max_price = row['max_price'] if max_price is None else max(max_price, row['max_price'])
+
+    return {
+        'total': total,
+        'brands': [
+            {'value': brand, 'count': count}
+            for brand, count in sorted(brands.items(), key=lambda item: (-item[1], item[0].lower()))
+        ],
+        'categories': [
+            {'slug': slug, 'name': name, 'count': count}
+            for (slug, name), count in sorted(categories.items(), key=lambda item: (-item[1], item[0][1]))
+        ],
+        'price_buckets': [
+            {
+                'min': lower,
+                'max': PRICE_BUCKETS[index + 1] if index + 1 < len(PRICE_BUCKETS) else None,
+                'count': buckets[index]
+            }
+            for index, lower in enumerate(PRICE_BUCKETS)
+        ],
+        'stock': stock,
+        'price_range': {
+            'min_price': float(min_price) if min_price is not None else None,
+            'max_price': float(max_price) if max_price is not None else None
+        }
+    }
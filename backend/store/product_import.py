@@ -0,0 +1,244 @@
+import codecs
+import csv
+import json
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import CharField
+from django.utils import timezone
+from .attribute_index import index_product_attributes
+from .autocomplete import suggestion_index
+from .catalog_cache import bump_catalog_version
+from .image_pipeline import image_pipeline, needs_derivatives
+from .models import Category, Product
+from .product_cards import refresh_product_cards
+from .search_index import index_products
+from .slugs import allocate_slugs
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+IMPORT_CHUNK_SIZE = 1000
+
+# Columns a file may set; any others are ignored. `category` is a category slug.
+IMPORT_FIELDS = (
+    'name', 'slug', 'category', 'brand', 'model_number', 'description', 'specifications',
+    'price', 'actual_price', 'discount_percentage', 'offer_text', 'exchange_available',
+    'exchange_discount', 'image_url', 'image_urls', 'video_url', 'stock', 'available',
+    'warranty_months',
+)
+JSON_FIELDS = ('specifications', 'image_urls')
+BOOLEAN_FIELDS = ('exchange_available', 'available')
+BOOLEAN_VALUES = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+REQUIRED_FOR_CREATE = ('name', 'price')
+
+def import_format(name, requested=None):
+    """File format from an explicit choice or the file extension"""
+    fmt = (requested or name.rsplit('.', 1)[-1]).lower()
+    if fmt == 'ndjson':
+        fmt = 'jsonl'
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}', use one of: {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+def read_rows(stream, fmt):
+    """Yield (line, row) for each record of a binary stream, row is an error string for unreadable records"""
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield line, f'Invalid JSON: {e}'
+            continue
+        yield line, row if isinstance(row, dict) else 'Each line must be a JSON object'
+
+def clean_row(row, fields=IMPORT_FIELDS, explicit=False):
+    """
+    Validated values of a row's `fields`, and errors by field. Blank values count
+    as not given, unless `explicit`: then every field the row has is cleaned, and
+    None clears a nullable field.
+    """
+    data = {}
+    errors = {}
+    for name in fields:
+        if explicit and name not in row:
+            continue
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if not explicit and (value is None or value == ''):
+            continue
+        try:
+            if explicit and value == '' and not isinstance(Product._meta.get_field(name), CharField):
+                # A blank number isn't dropped silently, clearing is asked for with null
+                if Product._meta.get_field(name).null:
+                    raise ValidationError('A value is required, use null to clear this field.')
+                raise ValidationError('A value is required.')
+            if name == 'category':
+                data[name] = str(value)
+                continue
+            if name in BOOLEAN_FIELDS and isinstance(value, str):
+                value = BOOLEAN_VALUES.get(value.lower(), value)
+            if name in JSON_FIELDS and isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    raise ValidationError('Invalid JSON')
+            data[name] = Product._meta.get_field(name).clean(value, None)
+        except ValidationError as e:
+            errors[name] = e.messages
+    return data, errors
+
+class ProductImporter:
+    """
+    Creates and updates products from rows, a chunk at a time. Rows whose slug
+    matches an existing product update it with the columns they give, other rows
+    create a product. Each chunk is written with bulk_create/bulk_update in one
+    transaction, then indexed; the catalog cache is invalidated once at the end.
+    """
+
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.summary = {'rows': 0, 'created': 0, 'updated': 0, 'errors': 0}
+        self.categories = {}
+        self.seen_slugs = set()
+
+    def run(self, rows):
+        """Import (line, row) pairs, yielding a report entry per row"""
+        chunk = []
+        for line, row in rows:
+            chunk.append((line, row))
+            if len(chunk) >= self.chunk_size:
+                yield from self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self.import_chunk(chunk)
+
+        if not self.dry_run and (self.summary['created'] or self.summary['updated']):
+            bump_catalog_version()
+
+    def report(self, line, status, product=None, slug=None, errors=None):
+        self.summary['rows'] += 1
+        self.summary['errors' if status == 'error' else status] += 1
+        entry = {'line': line, 'status': status}
+        if product is not None:
+            entry['id'] = product.id
+            entry['slug'] = product.slug
+        elif slug:
+            entry['slug'] = slug
+        if errors:
+            entry['errors'] = errors
+        return entry
+
+    def resolve_categories(self, slugs):
+        missing = [slug for slug in set(slugs) if slug not in self.categories]
+        if missing:
+            found = {category.slug: category for category in Category.objects.filter(slug__in=missing)}
+            for slug in missing:
+                self.categories[slug] = found.get(slug)
+
+    def import_chunk(self, chunk):
+        reports = {}
+        cleaned = []
+        for line, row in chunk:
+            if isinstance(row, str):
+                reports[line] = self.report(line, 'error', errors={'row': [row]})
+                continue
+            data, errors = clean_row(row)
+            if errors:
+                reports[line] = self.report(line, 'error', slug=data.get('slug'), errors=errors)
+                continue
+            cleaned.append((line, data))
+
+        self.resolve_categories(data['category'] for _, data in cleaned if 'category' in data)
+        existing = {
+            product.slug: product
+            for product in Product.objects.filter(
+                slug__in=[data['slug'] for _, data in cleaned if 'slug' in data]
+            ).select_related('category').defer('video_file')
+        }
+
+        creates, updates = [], []
+        new_without_slug = []
+        update_fields = set()
+        now = timezone.now()
+        for line, data in cleaned:
+            slug = data.get('slug')
+            if slug and slug in self.seen_slugs:
+                reports[line] = self.report(line, 'error', slug=slug, errors={'slug': ['Duplicate slug in this file']})
+                continue
+
+            category_slug = data.pop('category', None)
+            if category_slug is not None:
+                data['category'] = self.categories.get(category_slug)
+                if data['category'] is None:
+                    reports[line] = self.report(line, 'error', slug=slug, errors={'category': [f'Category {category_slug} not found']})
+                    continue
+
+            product = existing.get(slug) if slug else None
+            if product is None:
+                missing = [field for field in REQUIRED_FOR_CREATE if field not in data]
+                if missing:
+                    reports[line] = self.report(line, 'error', slug=slug, errors={
+                        field: ['This field is required for new products.'] for field in missing
+                    })
+                    continue
+                product = Product(**data)
+                product.description = product.description or ''
+                creates.append((line, product))
+                if not slug:
+                    new_without_slug.append(product)
+            else:
+                for field, value in data.items():
+                    setattr(product, field, value)
+                # bulk_update skips auto_now
+                product.updated = now
+                update_fields.update(data)
+                updates.append((line, product))
+            if slug:
+                self.seen_slugs.add(slug)
+
+        slugs = allocate_slugs([p.name for p in new_without_slug], taken=self.seen_slugs, dry_run=self.dry_run)
+        for product, slug in zip(new_without_slug, slugs):
+            product.slug = slug
+            self.seen_slugs.add(slug)
+
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create([product for _, product in creates], batch_size=500)
+                if updates:
+                    update_fields.discard('slug')
+                    Product.objects.bulk_update(
+                        [product for _, product in updates], sorted(update_fields | {'updated'}), batch_size=500
+                    )
+
+                products = [product for _, product in creates + updates]
+                if self.dry_run:
+                    transaction.set_rollback(True)
+                else:
+                    # bulk writes send no signals, so the indexes are updated here
+                    index_products(products)
+                    index_product_attributes(products)
+        except IntegrityError as e:
+            for line, product in creates + updates:
+                reports[line] = self.report(line, 'error', slug=product.slug, errors={'row': [f'Not saved: {e}']})
+        else:
+            if not self.dry_run:
+                refresh_product_cards([product.id for product in products])
+                for product in products:
+                    suggestion_index.update_product(product)
+                    if needs_derivatives(product):
+                        image_pipeline.submit(product.id)
+            for line, product in creates:
+                reports[line] = self.report(line, 'created', product=None if self.dry_run else product, slug=product.slug)
+            for line, product in updates:
+                reports[line] = self.report(line, 'updated', product=product)
+
+        for line, _ in chunk:
+            yield reports[line]
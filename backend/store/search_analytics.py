@@ -0,0 +1,76 @@
+from datetime import timedelta
+from django.db.models import Sum
+from django.utils import timezone
+from .models import SearchQueryDaily
+from .spelling import spelling_corrector
+
+DEFAULT_REPORT_DAYS = 30
+MAX_REPORT_DAYS = 365
+DEFAULT_REPORT_LIMIT = 20
+MAX_REPORT_LIMIT = 100
+
+def _rate(part, total):
+    return round(part / total * 100, 2) if total else 0.0
+
+def _trend(current, previous):
+    """Percentage change from the previous period, None when there was nothing before"""
+    return round((current - previous) / previous * 100, 2) if previous else None
+
+def _totals(rows):
+    totals = rows.aggregate(
+        searches=Sum('count'), zero_results=Sum('zero_result_count'), low_results=Sum('low_result_count')
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    totals['zero_result_rate'] = _rate(totals['zero_results'], totals['searches'])
+    totals['low_result_rate'] = _rate(totals['low_results'], totals['searches'])
+    return totals
+
+def _ranked_queries(current, previous, counter, limit):
+    """Top queries by one failure counter, with their previous-period count and daily series"""
+    top = list(
+        current.values('query').annotate(
+            searches=Sum('count'), failures=Sum(counter)
+        ).filter(failures__gt=0).order_by('-failures', '-searches', 'query')[:limit]
+    )
+    queries = [row['query'] for row in top]
+
+    before = dict(
+        previous.filter(query__in=queries).values('query').annotate(failures=Sum(counter)).values_list('query', 'failures')
+    )
+    daily = {}
+    for query, day, failures in current.filter(query__in=queries).order_by('day').values_list('query', 'day', counter):
+        daily.setdefault(query, []).append({'day': day.isoformat(), 'count': failures})
+
+    return [
+        {
+            'query': row['query'],
+            'searches': row['searches'],
+            'count': row['failures'],
+            'rate': _rate(row['failures'], row['searches']),
+            'previous_count': before.get(row['query'], 0),
+            'trend': _trend(row['failures'], before.get(row['query'], 0)),
+            'daily': daily.get(row['query'], []),
+            'closest_terms': spelling_corrector.closest_catalog_terms(row['query']),
+        }
+        for row in top
+    ]
+
+def search_analytics_report(days=DEFAULT_REPORT_DAYS, limit=DEFAULT_REPORT_LIMIT):
+    """
+    Zero-result and low-result searches of the last `days` days, compared with
+    the period before, from the daily search rollup.
+    """
+    today = timezone.now().date()
+    start = today - timedelta(days=days - 1)
+    previous_start = start - timedelta(days=days)
+
+    current = SearchQueryDaily.objects.filter(day__gte=start, day__lte=today)
+    previous = SearchQueryDaily.objects.filter(day__gte=previous_start, day__lt=start)
+
+    return {
+        'period': {'days': days, 'start': start.isoformat(), 'end': today.isoformat()},
+        'totals': _totals(current),
+        'previous_totals': _totals(previous),
+        'zero_result_queries': _ranked_queries(current, previous, 'zero_result_count', limit),
+        'low_result_queries': _ranked_queries(current, previous, 'low_result_count', limit),
+    }
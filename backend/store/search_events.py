@@ -0,0 +1,101 @@
+import atexit
+import threading
+import time
+from django.db import connections, transaction
+from .models import SearchQuery
+from .search_rollup import normalize_query, rollup_events
+
+# Events are written once this many are pending, or every FLUSH_INTERVAL seconds
+FLUSH_SIZE = 200
+FLUSH_INTERVAL = 5
+
+# Beyond this many pending events new ones are dropped rather than queued
+MAX_PENDING = 5000
+
+# The same query from the same client within this window is recorded once
+COALESCE_WINDOW = 30
+
+class SearchEventBuffer:
+    """
+    Per-worker write-behind buffer for search tracking. Events are queued in
+    memory and written with bulk_create by a background thread, together with
+    their daily rollup, so search traffic doesn't turn into one insert per request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = []
+        self.recent = {}
+        self.dropped = 0
+        self.thread = None
+
+    def add(self, query, user_id=None, results_count=0, ip_address=None):
+        """Queue a search event, returns False when it was coalesced or dropped"""
+        now = time.monotonic()
+        key = (user_id or ip_address, normalize_query(query))
+        with self.lock:
+            seen = self.recent.get(key)
+            if seen is not None and now - seen < COALESCE_WINDOW:
+                return False
+            if len(self.pending) >= MAX_PENDING:
+                self.dropped += 1
+                return False
+
+            self.recent[key] = now
+            if len(self.recent) > MAX_PENDING:
+                self.recent = {
+                    recent_key: seen for recent_key, seen in self.recent.items()
+                    if now - seen < COALESCE_WINDOW
+                }
+            self.pending.append(SearchQuery(
+                query=query,
+                user_id=user_id,
+                results_count=results_count,
+                ip_address=ip_address
+            ))
+            full = len(self.pending) >= FLUSH_SIZE
+
+        self.ensure_started()
+        if full:
+            self.wakeup.set()
+        return True
+
+    def flush(self):
+        """Write every pending event, returns how many were written"""
+        with self.lock:
+            events, self.pending = self.pending, []
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            print(f"Search event buffer full: {dropped} events dropped")
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                SearchQuery.objects.bulk_create(events, batch_size=500)
+                rollup_events(events)
+        except Exception as e:
+            print(f"Search event flush error: {e}")
+            return 0
+        return len(events)
+
+    def ensure_started(self):
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self._run, daemon=True)
+                    self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(FLUSH_INTERVAL)
+            self.wakeup.clear()
+            self.flush()
+            # This thread's connection would otherwise stay open between flushes
+            connections.close_all()
+
+search_event_buffer = SearchEventBuffer()
+
+# Pending events are written when the worker exits
+atexit.register(search_event_buffer.flush)
@@ -0,0 +1,319 @@
+import hashlib
+import math
+import re
+from collections import Counter, defaultdict
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from .catalog_cache import get_catalog_version
+from .models import Product, SearchIndexEntry, SearchTrigram
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+MAX_TERM_LENGTH = 64
+
+# Terms shorter than this are matched exactly, longer ones as prefixes
+# so "phone" still finds "phones" the way icontains used to
+PREFIX_MIN_LENGTH = 3
+
+# Product fields that feed the index - saves touching only other fields skip reindexing
+INDEXED_PRODUCT_FIELDS = {'name', 'brand', 'category', 'category_id', 'description', 'specifications'}
+
+# BM25F weights - a name match counts for more than a description match
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'brand': 2.5,
+    'category': 2.0,
+    'specifications': 1.2,
+    'description': 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Corpus-wide statistics drift slowly, so they are cached rather than recomputed per query
+STATS_CACHE_TIMEOUT = 600
+
+# Fields whose terms get trigrams for typo-tolerant matching
+FUZZY_FIELDS = ('name', 'brand')
+FUZZY_MIN_LENGTH = 4
+FUZZY_CANDIDATES = 50
+FUZZY_CACHE_TIMEOUT = 300
+
+# Rankings are kept per catalog version, so every page of a search slices the same one
+RANKING_CACHE_TIMEOUT = 300
+# List params that change neither the matches nor their order
+RANKING_PAGE_PARAMS = {'search', 'sort_by', 'cursor', 'page_size', 'limit', 'fields', 'exclude', 'autocorrect'}
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric search terms"""
+    if not text:
+        return []
+    return [term[:MAX_TERM_LENGTH] for term in TOKEN_PATTERN.findall(str(text).lower())]
+
+def _flatten_specifications(specifications):
+    """Collect keys and values of the specifications JSON as plain text"""
+    if isinstance(specifications, dict):
+        parts = []
+        for key, value in specifications.items():
+            parts.append(str(key))
+            parts.append(_flatten_specifications(value))
+        return ' '.join(parts)
+    if isinstance(specifications, (list, tuple)):
+        return ' '.join(_flatten_specifications(value) for value in specifications)
+    if specifications is None:
+        return ''
+    return str(specifications)
+
+def get_document_fields(product):
+    """Text of every indexed field for a product"""
+    return {
+        'name': product.name,
+        'brand': product.brand,
+        'category': product.category.name if product.category_id else '',
+        'description': product.description,
+        'specifications': _flatten_specifications(product.specifications),
+    }
+
+def build_entries(product):
+    """Posting rows for a single product"""
+    entries = []
+    for field, text in get_document_fields(product).items():
+        terms = tokenize(text)
+        for term, frequency in Counter(terms).items():
+            entries.append(SearchIndexEntry(
+                term=term,
+                product_id=product.id,
+                field=field,
+                term_frequency=frequency,
+                field_length=len(terms)
+            ))
+    return entries
+
+def index_products(products):
+    """Replace the index entries of the given products"""
+    products = list(products)
+    if not products:
+        return 0
+
+    entries = []
+    for product in products:
+        entries.extend(build_entries(product))
+
+    # Trigrams are only ever added here - stale terms are dropped by rebuild_index.
+    # Terms already in the vocabulary have all their trigrams, so only new ones are added.
+    fuzzy_terms = {entry.term for entry in entries if entry.field in FUZZY_FIELDS}
+    known_terms = set(SearchTrigram.objects.filter(term__in=fuzzy_terms).values_list('term', flat=True).distinct())
+    trigrams = [
+        SearchTrigram(trigram=trigram, term=term)
+        for term in fuzzy_terms - known_terms
+        for trigram in get_trigrams(term)
+    ]
+
+    with transaction.atomic():
+        SearchIndexEntry.objects.filter(product_id__in=[p.id for p in products]).delete()
+        SearchIndexEntry.objects.bulk_create(entries, batch_size=1000)
+        SearchTrigram.objects.bulk_create(trigrams, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
+
+def rebuild_index(chunk_size=500):
+    """Rebuild the whole index, reading products in chunks"""
+    SearchIndexEntry.objects.all().delete()
+    SearchTrigram.objects.all().delete()
+
+    products = Product.objects.select_related('category').order_by('id')
+    indexed = 0
+    chunk = []
+    for product in products.iterator(chunk_size=chunk_size):
+        chunk.append(product)
+        if len(chunk) >= chunk_size:
+            index_products(chunk)
+            indexed += len(chunk)
+            chunk = []
+    if chunk:
+        index_products(chunk)
+        indexed += len(chunk)
+    return indexed
+
+def term_condition(terms):
+    """Q matching index rows for any of the given terms"""
+    condition = Q()
+    for term in set(terms):
+        if len(term) < PREFIX_MIN_LENGTH:
+            condition |= Q(term=term)
+        else:
+            condition |= Q(term__startswith=term)
+    return condition
+
+def get_trigrams(term):
+    """Character trigrams of a term, padded so word boundaries count"""
+    padded = f'${term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_edit_distance(source, target, max_distance):
+    """
+    Edit distance counting swapped neighbours as one edit, or
+    max_distance + 1 once it is certain to be exceeded
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i]
+        for j in range(1, len(target) + 1):
+            cost = source[i - 1] != target[j - 1]
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+def max_edits_for(term):
+    return 1 if len(term) < 7 else 2
+
+def fuzzy_terms(term):
+    """Vocabulary terms within a small edit distance of a misspelled term"""
+    if len(term) < FUZZY_MIN_LENGTH:
+        return []
+
+    cache_key = f'search_index:fuzzy:{term}'
+    matches = cache.get(cache_key)
+    if matches is not None:
+        return matches
+
+    # Candidates share the most trigrams, then an edit-distance check confirms them
+    candidates = SearchTrigram.objects.filter(
+        trigram__in=get_trigrams(term)
+    ).values('term').annotate(shared=Count('id')).filter(
+        shared__gte=2
+    ).order_by('-shared')[:FUZZY_CANDIDATES]
+
+    max_edits = max_edits_for(term)
+    scored = []
+    for candidate in candidates:
+        distance = bounded_edit_distance(term, candidate['term'], max_edits)
+        if distance <= max_edits:
+            scored.append((distance, -candidate['shared'], candidate['term']))
+    matches = [candidate for _, _, candidate in sorted(scored)]
+
+    cache.set(cache_key, matches, FUZZY_CACHE_TIMEOUT)
+    return matches
+
+def search_terms(query):
+    """
+    Terms to look up for a search query. Terms with no hit in the index
+    are replaced by their closest spellings from product names and brands,
+    and synonyms from the search dictionary are added.
+    """
+    from .synonyms import synonym_dictionary
+
+    query_terms = list(dict.fromkeys(tokenize(query)))
+    terms = []
+    for term in query_terms:
+        if SearchIndexEntry.objects.filter(term_condition([term])).exists():
+            terms.append(term)
+        else:
+            terms.extend(fuzzy_terms(term))
+    terms.extend(synonym_dictionary.expand(query_terms))
+    return list(dict.fromkeys(terms))
+
+def matching_products(query):
+    """Subquery of product ids matching any term of the search query"""
+    terms = search_terms(query)
+    if not terms:
+        return SearchIndexEntry.objects.none().values('product_id')
+    return SearchIndexEntry.objects.filter(term_condition(terms)).values('product_id')
+
+def _term_matches(index_term, query_term):
+    if len(query_term) < PREFIX_MIN_LENGTH:
+        return index_term == query_term
+    return index_term.startswith(query_term)
+
+def get_corpus_stats():
+    """Document count and average length of every indexed field"""
+    stats = cache.get('search_index:corpus_stats')
+    if stats is None:
+        document_count = Product.objects.count()
+        totals = SearchIndexEntry.objects.values('field').annotate(total=Sum('term_frequency'))
+        average_lengths = {
+            row['field']: row['total'] / document_count
+            for row in totals
+        } if document_count else {}
+        stats = {'document_count': document_count, 'average_lengths': average_lengths}
+        cache.set('search_index:corpus_stats', stats, STATS_CACHE_TIMEOUT)
+    return stats
+
+def get_document_frequencies(terms):
+    """Number of products matching each query term"""
+    keys = {term: f'search_index:df:{term}' for term in terms}
+    cached = cache.get_many(keys.values())
+
+    frequencies = {}
+    for term, key in keys.items():
+        if key in cached:
+            frequencies[term] = cached[key]
+            continue
+        frequencies[term] = SearchIndexEntry.objects.filter(
+            term_condition([term])
+        ).values('product_id').distinct().count()
+        cache.set(key, frequencies[term], STATS_CACHE_TIMEOUT)
+    return frequencies
+
+def rank_products(query, candidates):
+    """
+    BM25F relevance of the candidate products for a search query.
+    Returns (product_id, score) pairs, best match first.
+    """
+    terms = sorted(set(search_terms(query)))
+    if not terms:
+        return []
+
+    stats = get_corpus_stats()
+    document_count = max(stats['document_count'], 1)
+    frequencies = get_document_frequencies(terms)
+    idf = {
+        term: math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+        for term, df in frequencies.items()
+    }
+
+    # Length-normalised, field-weighted term frequency per (product, query term)
+    weighted_tf = defaultdict(float)
+    postings = SearchIndexEntry.objects.filter(
+        term_condition(terms), product_id__in=candidates
+    ).values_list('product_id', 'term', 'field', 'term_frequency', 'field_length')
+
+    for product_id, index_term, field, frequency, length in postings.iterator(chunk_size=2000):
+        average_length = stats['average_lengths'].get(field) or 1
+        normalised = frequency / (1 - BM25_B + BM25_B * length / average_length)
+        for term in terms:
+            if _term_matches(index_term, term):
+                weighted_tf[(product_id, term)] += FIELD_WEIGHTS.get(field, 1.0) * normalised
+
+    scores = defaultdict(float)
+    for (product_id, term), tf in weighted_tf.items():
+        scores[product_id] += idf[term] * tf / (BM25_K1 + tf)
+
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+def cached_ranking(query, candidates, params):
+    """
+    rank_products for a product list request. The ranking of a query and its
+    filters is cached under the catalog version, so later pages slice it
+    rather than loading the postings of every match and scoring them again.
+    """
+    filters = sorted(
+        (key, value.strip())
+        for key, values in params.lists() if key not in RANKING_PAGE_PARAMS
+        for value in values if value.strip()
+    )
+    raw = f"{' '.join(tokenize(query))}|{filters}"
+    key = f'search_ranking:{get_catalog_version()}:{hashlib.sha1(raw.encode()).hexdigest()}'
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = rank_products(query, candidates)
+        cache.set(key, ranking, RANKING_CACHE_TIMEOUT)
+    return ranking
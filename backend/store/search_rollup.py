@@ -0,0 +1,74 @@
+from collections import Counter
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from .models import SearchQuery, SearchQueryDaily
+
+POPULAR_SEARCH_DAYS = 30
+POPULAR_SEARCH_LIMIT = 10
+POPULAR_SEARCHES_CACHE_KEY = 'search:popular'
+POPULAR_SEARCHES_CACHE_TIMEOUT = 60
+
+# Searches finding at least one but no more than this many products count as low-result
+LOW_RESULT_THRESHOLD = 3
+
+# Raw SearchQuery rows are kept this long; the daily rollup is kept for good
+RAW_RETENTION_DAYS = 30
+
+def normalize_query(query):
+    return ' '.join(str(query).lower().split())[:255]
+
+def rollup_events(events):
+    """Add a batch of new SearchQuery events to the daily rollup"""
+    totals = Counter()
+    zero_results = Counter()
+    low_results = Counter()
+    for event in events:
+        query = normalize_query(event.query)
+        if not query:
+            continue
+        key = (query, (event.created_at or timezone.now()).date())
+        totals[key] += 1
+        if not event.results_count:
+            zero_results[key] += 1
+        elif event.results_count <= LOW_RESULT_THRESHOLD:
+            low_results[key] += 1
+    if not totals:
+        return
+
+    with transaction.atomic():
+        # Create the missing rows, then increment every row in place so
+        # concurrent flushes add up instead of overwriting each other
+        SearchQueryDaily.objects.bulk_create([
+            SearchQueryDaily(query=query, day=day) for query, day in totals
+        ], batch_size=500, ignore_conflicts=True)
+        for (query, day), count in totals.items():
+            SearchQueryDaily.objects.filter(query=query, day=day).update(
+                count=F('count') + count,
+                zero_result_count=F('zero_result_count') + zero_results[(query, day)],
+                low_result_count=F('low_result_count') + low_results[(query, day)]
+            )
+
+def popular_search_terms(days=POPULAR_SEARCH_DAYS, limit=POPULAR_SEARCH_LIMIT):
+    """Most searched queries that found results, from the daily rollup"""
+    popular = cache.get(POPULAR_SEARCHES_CACHE_KEY)
+    if popular is None:
+        since = timezone.now().date() - timedelta(days=days)
+        rows = SearchQueryDaily.objects.filter(day__gte=since).values('query').annotate(
+            successful=Sum(F('count') - F('zero_result_count'))
+        ).filter(successful__gt=0).order_by('-successful', 'query')[:limit]
+        popular = [row['query'] for row in rows]
+        cache.set(POPULAR_SEARCHES_CACHE_KEY, popular, POPULAR_SEARCHES_CACHE_TIMEOUT)
+    return popular
+
+def prune_search_queries(days=RAW_RETENTION_DAYS, batch_size=5000):
+    """Delete raw search events older than `days`, a batch at a time"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(SearchQuery.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += SearchQuery.objects.filter(id__in=ids).delete()[0]
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Category, Product, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Compare, Offer
+from django.urls import reverse
+from .models import Category, Product, ProductCard, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Compare, Offer
+from .video_utils import video_version
+from .image_pipeline import derivative_urls, primary_source, source_derivatives
+from .avatars import profile_image_status, profile_image_urls
 
 class UserSerializer(serializers.ModelSerializer):
     profile_image = serializers.SerializerMethodField()
@@ -11,8 +15,9 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_profile_image(self, obj):
         try:
-            if hasattr(obj, 'userprofile') and obj.userprofile.profile_picture:
-                return obj.userprofile.profile_picture.url
+            if hasattr(obj, 'userprofile'):
+                urls = profile_image_urls(obj.userprofile)
+                return urls['large'] if urls else None
         except:
             pass
         return None
@@ -23,18 +28,19 @@ class UserProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UserProfile
-        fields = '__all__'
+        exclude = ['profile_picture_pending', 'avatar_variants']
         extra_kwargs = {
             'profile_picture': {'write_only': True}
         }
     
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        # Map profile_picture to profile_image for frontend
-        if instance.profile_picture:
-            data['profile_image'] = instance.profile_picture.url
-        else:
-            data['profile_image'] = None
+        # Map profile_picture to profile_image for frontend; a placeholder
+        # until a new upload has been processed, then the avatar sizes
+        urls = profile_image_urls(instance)
+        data['profile_image'] = urls['large'] if urls else None
+        data['profile_images'] = urls
+        data['profile_image_status'] = profile_image_status(instance)
         return data
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -42,39 +48,160 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = '__all__'
 
+# Compact product projection for grids, cart, wishlist and order rows
+PRODUCT_CARD_FIELDS = (
+    'id', 'slug', 'name', 'brand', 'category', 'price', 'actual_price', 'discount_percentage',
+    'offer_text', 'exchange_available', 'exchange_discount', 'image', 'image_url', 'image_urls',
+    'image_srcset', 'stock', 'available', 'average_rating', 'review_count',
+)
+
 class ProductSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
-    average_rating = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
+    # Stored aggregates, no per-product review queries
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
+    # Streaming URL of the stored video, versioned by its content hash
+    video_file = serializers.SerializerMethodField()
+    # Resized derivatives of the card image and the gallery images, None until they are rendered
+    image_srcset = serializers.SerializerMethodField()
+    image_urls_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['video', 'image_variants']
+        read_only_fields = ['rating_sum', 'rating_count', 'average_rating']
     
-    def get_average_rating(self, obj):
-        try:
-            return obj.get_average_rating()
-        except:
-            return 0
+    def __init__(self, *args, fields=None, **kwargs):
+        self.selected_fields = fields
+        super().__init__(*args, **kwargs)
     
-    def get_review_count(self, obj):
-        try:
-            return obj.get_review_count()
-        except:
-            return 0
+    def get_fields(self):
+        fields = super().get_fields()
+        # Subset chosen by the view from the request, else the one given by the parent serializer
+        selected = self.context.get('product_fields', self.selected_fields)
+        if selected is not None:
+            for name in set(fields) - set(selected):
+                fields.pop(name)
+        return fields
+    
+    def get_video_file(self, obj):
+        if not obj.video:
+            return None
+        url = f"{reverse('product-video', args=[obj.id])}?v={video_version(obj.video.name)}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def _image_url(self, name):
+        url = reverse('product-image', args=[name.rsplit('/', 1)[-1]])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_image_srcset(self, obj):
+        return derivative_urls(source_derivatives(obj, primary_source(obj)), self._image_url)
+    
+    def get_image_urls_srcset(self, obj):
+        return [derivative_urls(source_derivatives(obj, source), self._image_url) for source in obj.image_urls or []]
     
     def to_representation(self, instance):
         data = super().to_representation(instance)
         # Ensure consistent price formatting
-        data['price'] = float(instance.price)
-        if instance.actual_price:
+        if 'price' in data:
+            data['price'] = float(instance.price)
+        if data.get('actual_price'):
             data['actual_price'] = float(instance.actual_price)
-        if instance.discount_percentage:
+        if data.get('discount_percentage'):
             data['discount_percentage'] = float(instance.discount_percentage)
         return data
 
+# Serializer fields backed by differently named model columns
+PRODUCT_FIELD_COLUMNS = {
+    'review_count': ('rating_count',),
+    'video_file': ('video',),
+    'image_srcset': ('image_variants', 'image', 'image_url', 'image_urls'),
+    'image_urls_srcset': ('image_variants', 'image_urls'),
+}
+
+def get_product_fields(params, default=None):
+    """
+    Product fields selected by `fields=` and `exclude=` query params.
+    `fields=all` selects the full payload, otherwise `default` applies
+    (all fields when None). Unknown names are ignored.
+    """
+    available = list(ProductSerializer().fields)
+    requested = params.get('fields')
+    if requested == 'all':
+        fields = available
+    elif requested:
+        names = {name.strip() for name in requested.split(',')}
+        fields = [name for name in available if name in names]
+    else:
+        fields = list(default) if default is not None else available
+    
+    excluded = {name.strip() for name in params.get('exclude', '').split(',')}
+    fields = [name for name in fields if name not in excluded or name == 'id']
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+def deferred_product_columns(fields, prefix=''):
+    """Product model columns not needed to serialize `fields`, for queryset.defer()"""
+    needed = {column for name in fields for column in PRODUCT_FIELD_COLUMNS.get(name, (name,))}
+    return [
+        prefix + field.name for field in Product._meta.concrete_fields
+        if field.name not in needed and not field.primary_key
+    ]
+
+class ProductCardSerializer(serializers.ModelSerializer):
+    """Grid row from the product card read model"""
+    id = serializers.IntegerField(source='product_id', read_only=True)
+    category = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ProductCard
+        fields = [
+            'id', 'slug', 'name', 'brand', 'category', 'price', 'actual_price', 'discount_percentage',
+            'offer_text', 'exchange_available', 'exchange_discount', 'thumbnail', 'thumbnail_srcset',
+            'average_rating', 'review_count', 'in_stock', 'available', 'offer_badge',
+        ]
+    
+    def _absolute(self, url):
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request and url.startswith('/') else url
+    
+    def get_category(self, obj):
+        if not obj.category_slug:
+            return None
+        return {'slug': obj.category_slug, 'name': obj.category_name}
+    
+    def get_thumbnail(self, obj):
+        return self._absolute(obj.thumbnail) if obj.thumbnail else None
+    
+    def get_thumbnail_srcset(self, obj):
+        if not obj.srcset:
+            return None
+        return ', '.join(f'{self._absolute(path)} {width}w' for path, width in obj.srcset)
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Same number formatting as ProductSerializer
+        data['price'] = float(instance.price)
+        if instance.actual_price is not None:
+            data['actual_price'] = float(instance.actual_price)
+        data['discount_percentage'] = float(instance.discount_percentage)
+        data['exchange_discount'] = float(instance.exchange_discount)
+        return data
+
+class WishlistCardSerializer(serializers.ModelSerializer):
+    # `card` is attached by the view from the card read model
+    product = ProductCardSerializer(source='card', read_only=True)
+    
+    class Meta:
+        model = Wishlist
+        fields = ['id', 'user', 'product', 'added_at']
+
 class CartItemSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = ProductSerializer(read_only=True, fields=PRODUCT_CARD_FIELDS)
     cost = serializers.SerializerMethodField()
     discounted_cost = serializers.SerializerMethodField()
     
@@ -112,14 +239,14 @@ class CartSerializer(serializers.ModelSerializer):
         return float(obj.get_total_discount())
 
 class WishlistSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = ProductSerializer(read_only=True, fields=PRODUCT_CARD_FIELDS)
     
     class Meta:
         model = Wishlist
         fields = '__all__'
 
 class OrderItemSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = ProductSerializer(read_only=True, fields=PRODUCT_CARD_FIELDS)
     cost = serializers.SerializerMethodField()
     discounted_cost = serializers.SerializerMethodField()
     
@@ -182,7 +309,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 class OfferSerializer(serializers.ModelSerializer):
-    products = ProductSerializer(many=True, read_only=True)
+    products = ProductSerializer(many=True, read_only=True, fields=PRODUCT_CARD_FIELDS)
     categories = CategorySerializer(many=True, read_only=True)
     combo_products = ProductSerializer(many=True, read_only=True)
     free_product = ProductSerializer(read_only=True)
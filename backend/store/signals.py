@@ -0,0 +1,137 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Category, Offer, Product, Review, SearchSynonym
+from .attribute_index import index_product_attributes
+from .search_index import index_products, INDEXED_PRODUCT_FIELDS
+from .autocomplete import suggestion_index
+from .catalog_cache import bump_catalog_version
+from .synonyms import synonym_dictionary
+from .image_pipeline import image_pipeline, needs_derivatives, IMAGE_FIELDS
+from .product_cards import refresh_offer_badges_on_commit, refresh_product_cards_on_commit, CARD_SOURCE_COLUMNS
+
+# Search index entries are removed with the product through the FK cascade,
+# so the search index only needs to handle saves
+
+@receiver(post_save, sender=Product)
+def reindex_product(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not INDEXED_PRODUCT_FIELDS.intersection(update_fields):
+        return
+    index_products([instance])
+
+@receiver(post_save, sender=Product)
+def reindex_product_attributes(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and 'specifications' not in update_fields:
+        return
+    index_product_attributes([instance])
+
+@receiver(post_save, sender=Product)
+def queue_product_image_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not IMAGE_FIELDS.intersection(update_fields):
+        return
+    if needs_derivatives(instance):
+        product_id = instance.id
+        transaction.on_commit(lambda: image_pipeline.submit(product_id))
+
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    index_products(instance.products.select_related('category'))
+
+@receiver(post_save, sender=Product)
+def refresh_product_suggestions(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not {'name', 'brand', 'available'}.intersection(update_fields):
+        return
+    suggestion_index.update_product(instance)
+
+@receiver(post_delete, sender=Product)
+def remove_product_suggestions(sender, instance, **kwargs):
+    suggestion_index.remove_product(instance.id)
+
+@receiver(post_save, sender=Category)
+def refresh_category_suggestions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        suggestion_index.update_category(instance)
+
+@receiver(post_delete, sender=Category)
+def remove_category_suggestions(sender, instance, **kwargs):
+    suggestion_index.remove_category(instance.id)
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_product_rating(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    product = Product.objects.filter(id=instance.product_id).first()
+    if product:
+        product.update_rating_aggregates()
+        # Aggregates are written with a queryset update, which sends no product signal
+        refresh_product_cards_on_commit([product.id])
+        bump_catalog_version()
+
+# Product cards - rebuilt after the write commits, so they read the committed product,
+# and the catalog version moves again once they are
+
+@receiver(post_save, sender=Product)
+def refresh_product_card(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not set(CARD_SOURCE_COLUMNS).intersection(update_fields):
+        return
+    refresh_product_cards_on_commit([instance.id])
+
+@receiver(post_save, sender=Category)
+def refresh_category_cards(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    refresh_product_cards_on_commit(instance.products.values_list('id', flat=True))
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def refresh_card_offer_badges(sender, raw=False, **kwargs):
+    if not raw:
+        refresh_offer_badges_on_commit()
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version()
+
+@receiver(m2m_changed, sender=Offer.products.through)
+@receiver(m2m_changed, sender=Offer.categories.through)
+def invalidate_catalog_cache_for_offer_targets(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    bump_catalog_version()
+    refresh_offer_badges_on_commit()
+    # Offer payloads embed their products and categories, so the offer's version moves too
+    offer_ids = pk_set if reverse else [instance.pk]
+    if offer_ids:
+        Offer.objects.filter(id__in=offer_ids).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Category)
+def touch_category_products(sender, instance, raw=False, created=False, **kwargs):
+    # Product payloads embed their category
+    if not raw and not created:
+        instance.products.update(updated=timezone.now())
+
+@receiver(post_save, sender=SearchSynonym)
+@receiver(post_delete, sender=SearchSynonym)
+def reload_search_synonyms(sender, **kwargs):
+    # Cached search responses were built with the old dictionary
+    synonym_dictionary.invalidate()
+    bump_catalog_version()
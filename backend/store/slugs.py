@@ -0,0 +1,125 @@
+import re
+from collections import Counter
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import Q
+from django.utils.text import slugify
+from .models import Product, SlugCounter
+
+SLUG_MAX_LENGTH = Product._meta.get_field('slug').max_length
+SUFFIX_PATTERN = re.compile(r'^(.*)-(\d+)$')
+
+# Bases per prefix query, so the OR'ed conditions stay within database expression limits
+SLUG_QUERY_BATCH = 100
+LOOKUP_BATCH = 500
+
+def base_slug(name):
+    # Leaves room for a "-<n>" suffix within the column length
+    return slugify(name)[:SLUG_MAX_LENGTH - 6].strip('-') or 'product'
+
+def slug_matches(slug, name):
+    """Whether `slug` could have been allocated for `name`: the bare base or the base with a suffix"""
+    base = base_slug(name)
+    match = SUFFIX_PATTERN.match(slug)
+    return slug == base or bool(match and match.group(1) == base)
+
+def _batches(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _first_free_suffixes(bases):
+    """
+    Counter seeds for bases seen for the first time, from the slugs products
+    already use. A "<base>-<n>" slug only counts as a suffix of `base` when its
+    product's name gives that base - in "iphone-15" the 15 is part of the name,
+    and "Iphone" products must not continue from it. Other clashes are skipped
+    over by allocate_slugs.
+    """
+    seeds = dict.fromkeys(bases, 0)
+    for batch in _batches(bases, SLUG_QUERY_BATCH):
+        # "<base>-" prefixes as index range scans ('.' sorts right after '-')
+        taken = Product.objects.filter(reduce(or_, (
+            Q(slug=base) | Q(slug__gte=f'{base}-', slug__lt=f'{base}.') for base in batch
+        ))).values_list('slug', 'name')
+        for slug, name in taken:
+            if slug in seeds:
+                seeds[slug] = max(seeds[slug], 1)
+            match = SUFFIX_PATTERN.match(slug)
+            if match and match.group(1) in seeds and base_slug(name) == match.group(1):
+                seeds[match.group(1)] = max(seeds[match.group(1)], int(match.group(2)) + 1)
+    return seeds
+
+def _locked_counters(bases):
+    counters = {}
+    for batch in _batches(sorted(bases), LOOKUP_BATCH):
+        # A fixed lock order keeps concurrent allocations from deadlocking
+        for counter in SlugCounter.objects.select_for_update().filter(base__in=batch).order_by('base'):
+            counters[counter.base] = counter
+    return counters
+
+def _reserve(bases):
+    """Next free suffix for each entry of `bases`, moving the counters past them"""
+    wanted = Counter(bases)
+    # Writing first takes the write lock up front on SQLite, rather than failing
+    # to upgrade a read lock; a concurrent allocation creating the same counters is fine
+    SlugCounter.objects.bulk_create(
+        [SlugCounter(base=base) for base in wanted], batch_size=LOOKUP_BATCH, ignore_conflicts=True
+    )
+    counters = _locked_counters(wanted)
+    unseeded = [base for base, counter in counters.items() if counter.next_suffix is None]
+    if unseeded:
+        for base, suffix in _first_free_suffixes(unseeded).items():
+            counters[base].next_suffix = suffix
+
+    suffixes = {}
+    for base, count in wanted.items():
+        suffixes[base] = counters[base].next_suffix
+        counters[base].next_suffix += count
+    # Most counters of a batch end on the same few values, one UPDATE per value
+    # is much cheaper than bulk_update's CASE over every row
+    by_value = {}
+    for base, counter in counters.items():
+        by_value.setdefault(counter.next_suffix, []).append(base)
+    for value, group in by_value.items():
+        for batch in _batches(group, LOOKUP_BATCH):
+            SlugCounter.objects.filter(base__in=batch).update(next_suffix=value)
+
+    slugs = []
+    for base in bases:
+        suffix = suffixes[base]
+        suffixes[base] += 1
+        slugs.append(f'{base}-{suffix}' if suffix else base)
+    return slugs
+
+def allocate_slugs(names, taken=(), dry_run=False):
+    """
+    Unique product slugs for `names`, in order. Suffixes come from a counter per
+    base that is locked while it moves, so concurrent allocations never hand out
+    the same slug. Slugs set by hand can still get in the counter's way; those
+    and the `taken` slugs are skipped over. With `dry_run` the counters are left as they were.
+    """
+    slugs = [None] * len(names)
+    pending = list(range(len(names)))
+    taken = set(taken)
+    with transaction.atomic():
+        while pending:
+            reserved = _reserve([base_slug(names[index]) for index in pending])
+            clashes = {slug for slug in reserved if slug in taken}
+            for batch in _batches(reserved, LOOKUP_BATCH):
+                clashes.update(Product.objects.filter(slug__in=batch).values_list('slug', flat=True))
+
+            retry = []
+            for index, slug in zip(pending, reserved):
+                if slug in clashes:
+                    retry.append(index)
+                else:
+                    slugs[index] = slug
+            pending = retry
+        if dry_run:
+            transaction.set_rollback(True)
+    return slugs
+
+def allocate_slug(name):
+    return allocate_slugs([name])[0]
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from django.db import connections
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from .models import SearchIndexEntry, SearchQueryDaily
+from .search_index import bounded_edit_distance, max_edits_for, tokenize
+
+# Catalog fields whose words are worth suggesting - descriptions are too noisy
+VOCABULARY_FIELDS = ('name', 'brand', 'category')
+
+# Successful searches from this far back also feed the vocabulary,
+# each search weighing as much as this many products
+SEARCH_HISTORY_DAYS = 90
+SEARCH_TERM_WEIGHT = 2
+
+MIN_WORD_LENGTH = 3
+MAX_EDITS = 2
+
+# Deletes are generated from a word's first letters only, which bounds the
+# index size and the lookup cost; full words are then compared by edit distance
+PREFIX_LENGTH = 7
+
+# Safety net for catalog and search history changes made since the last build
+REBUILD_INTERVAL = 900
+
+def _deletes(word, max_edits):
+    """Every string reachable from `word` by removing up to `max_edits` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_edits):
+        frontier = {
+            candidate[:index] + candidate[index + 1:]
+            for candidate in frontier
+            for index in range(len(candidate))
+        } - results
+        results |= frontier
+    return results
+
+def _correctable(word):
+    return len(word) >= MIN_WORD_LENGTH and not word.isdigit()
+
+class SpellingCorrector:
+    """Per-worker symmetric-delete index over the catalog vocabulary and successful searches"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built_at = None
+        self.rebuilding = False
+        self.frequencies = {}
+        self.catalog_terms = set()
+        self.deletes = {}
+
+    def build(self):
+        frequencies = Counter()
+        rows = SearchIndexEntry.objects.filter(field__in=VOCABULARY_FIELDS).values('term').annotate(
+            products=Count('product_id', distinct=True)
+        ).values_list('term', 'products')
+        for term, products in rows.iterator(chunk_size=2000):
+            if _correctable(term):
+                frequencies[term] += products
+        catalog_terms = set(frequencies)
+
+        since = timezone.now().date() - timedelta(days=SEARCH_HISTORY_DAYS)
+        searches = SearchQueryDaily.objects.filter(day__gte=since).values('query').annotate(
+            searches=Sum(F('count') - F('zero_result_count'))
+        ).filter(searches__gt=0).values_list('query', 'searches')
+        for query, count in searches.iterator(chunk_size=2000):
+            for term in set(tokenize(query)):
+                if _correctable(term):
+                    frequencies[term] += count * SEARCH_TERM_WEIGHT
+
+        deletes = {}
+        for word in frequencies:
+            for deleted in _deletes(word[:PREFIX_LENGTH], MAX_EDITS):
+                deletes.setdefault(deleted, []).append(word)
+
+        with self.lock:
+            self.frequencies = dict(frequencies)
+            self.catalog_terms = catalog_terms
+            self.deletes = deletes
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None:
+            with self.lock:
+                if self.built_at is None:
+                    self.build()
+        elif time.monotonic() - self.built_at > REBUILD_INTERVAL and not self.rebuilding:
+            self.rebuilding = True
+            threading.Thread(target=self._background_rebuild, daemon=True).start()
+
+    def _background_rebuild(self):
+        try:
+            self.build()
+        except Exception as e:
+            print(f"Spelling index rebuild error: {e}")
+        finally:
+            connections.close_all()
+            self.rebuilding = False
+
+    def candidates(self, word):
+        """Known words within the edit limit of `word`, closest and then most frequent first"""
+        max_edits = max_edits_for(word)
+        candidates = set()
+        for deleted in _deletes(word[:PREFIX_LENGTH], max_edits):
+            candidates.update(self.deletes.get(deleted, ()))
+
+        scored = []
+        for candidate in candidates:
+            distance = bounded_edit_distance(word, candidate, max_edits)
+            if distance <= max_edits:
+                scored.append((distance, -self.frequencies[candidate], candidate))
+        return [candidate for _, _, candidate in sorted(scored)]
+
+    def correct_word(self, word):
+        """Closest known word - fewest edits, then most frequent - or the word itself"""
+        if word in self.frequencies or not _correctable(word):
+            return word
+        candidates = self.candidates(word)
+        return candidates[0] if candidates else word
+
+    def closest_catalog_terms(self, query, limit=3):
+        """Catalog words closest to the words of a query that the catalog doesn't contain"""
+        self.ensure_built()
+        terms = []
+        for word in dict.fromkeys(tokenize(query)):
+            if word in self.catalog_terms or not _correctable(word):
+                continue
+            terms.extend(candidate for candidate in self.candidates(word) if candidate in self.catalog_terms)
+        return list(dict.fromkeys(terms))[:limit]
+
+    def correct(self, query):
+        """Corrected form of a search query, or None when nothing in it needs correcting"""
+        self.ensure_built()
+        words = tokenize(query)
+        corrected = [self.correct_word(word) for word in words]
+        if corrected == words:
+            return None
+        return ' '.join(corrected)
+
+spelling_corrector = SpellingCorrector()
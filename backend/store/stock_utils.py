@@ -10,7 +10,8 @@ def update_checkout_stock(request):
             product.stock = max(0, product.stock - item.quantity)
             if product.stock == 0:
                 product.available = False
-            product.save()
+            # Only the stock columns, so the search and attribute indexes are left alone
+            product.save(update_fields=['stock', 'available', 'updated'])
             
         return True
     except Exception as e:
@@ -0,0 +1,109 @@
+import threading
+import time
+from django.core.cache import cache
+from .models import SearchSynonym
+from .search_index import tokenize
+
+SYNONYMS_VERSION_KEY = 'search_synonyms:version'
+
+# Per-query cost is bounded by these, however large the dictionary is:
+# at most MAX_PHRASE_WORDS lookups per query word, and a capped expansion
+MAX_PHRASE_WORDS = 4
+MAX_QUERY_TERMS = 16
+MAX_EXPANSION_TERMS = 20
+
+# Safety net for edits made through other workers, whose version bumps this process's cache never sees
+RELOAD_INTERVAL = 300
+
+def compile_synonyms(entries):
+    """Map each phrase, as a tuple of terms, to the phrases it expands to"""
+    phrases = {}
+    for entry in entries:
+        term = tuple(tokenize(entry.term))
+        synonyms = [tuple(tokenize(synonym)) for synonym in entry.get_synonyms()]
+        synonyms = [synonym for synonym in dict.fromkeys(synonyms) if synonym and synonym != term]
+        if not term or not synonyms:
+            continue
+
+        group = [term] + synonyms
+        sources = group if entry.two_way else [term]
+        for source in sources:
+            if len(source) > MAX_PHRASE_WORDS:
+                continue
+            expansions = phrases.setdefault(source, {})
+            for target in group:
+                if target != source:
+                    expansions[target] = None
+    return {source: list(expansions) for source, expansions in phrases.items()}
+
+class SynonymDictionary:
+    """Per-worker compiled search synonyms, reloaded when the dictionary changes"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.loaded_at = None
+        self.phrases = {}
+        self.max_words = 0
+
+    def get_version(self):
+        version = cache.get(SYNONYMS_VERSION_KEY)
+        if version is None:
+            cache.add(SYNONYMS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(SYNONYMS_VERSION_KEY)
+        return version
+
+    def invalidate(self):
+        """Make every worker sharing the cache reload the dictionary on its next query"""
+        try:
+            cache.incr(SYNONYMS_VERSION_KEY)
+        except ValueError:
+            cache.set(SYNONYMS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+    def load(self):
+        version = self.get_version()
+        phrases = compile_synonyms(SearchSynonym.objects.filter(is_active=True))
+        with self.lock:
+            self.phrases = phrases
+            self.max_words = max((len(phrase) for phrase in phrases), default=0)
+            self.version = version
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        version = self.get_version()
+        if (self.loaded_at is None or self.version != version
+                or time.monotonic() - self.loaded_at > RELOAD_INTERVAL):
+            with self.lock:
+                if (self.loaded_at is None or self.version != version
+                        or time.monotonic() - self.loaded_at > RELOAD_INTERVAL):
+                    self.load()
+
+    def expand(self, terms):
+        """
+        Extra search terms for the query terms. Longest phrases match first,
+        so "air conditioner" wins over "air" when both are entries.
+        """
+        try:
+            self.ensure_loaded()
+        except Exception as e:
+            print(f"Synonym dictionary load error: {e}")
+            return []
+
+        phrases = self.phrases
+        terms = list(terms)[:MAX_QUERY_TERMS]
+        extra = {}
+        position = 0
+        while position < len(terms) and len(extra) < MAX_EXPANSION_TERMS:
+            for length in range(min(self.max_words, len(terms) - position), 0, -1):
+                expansions = phrases.get(tuple(terms[position:position + length]))
+                if expansions:
+                    for phrase in expansions:
+                        for term in phrase:
+                            extra[term] = None
+                    position += length
+                    break
+            else:
+                position += 1
+        return [term for term in extra if term not in terms][:MAX_EXPANSION_TERMS]
+
+synonym_dictionary = SynonymDictionary()
@@ -4,6 +4,8 @@ from . import database_ml_views
 from . import revenue_refund_views
 from . import checkout_views
 from . import payment_views
+from . import video_views
+from . import image_views
 
 
 urlpatterns = [
@@ -16,8 +18,11 @@ urlpatterns = [
     
     # Products 
     path('products/', views.ProductListView.as_view(), name='product-list'),
+    path('products/facets/', views.product_facets, name='product-facets'),
+    path('products/id/<int:product_id>/', views.product_by_id, name='product-by-id'),  # Used by cart context; its own prefix so all-digit slugs still reach the slug route
     path('products/<slug:slug>/', views.ProductDetailView.as_view(), name='product-detail'),
-    path('products/<int:product_id>/', views.product_by_id, name='product-by-id'),  # Used by cart context
+    path('products/<int:product_id>/video/', video_views.stream_product_video, name='product-video'),
+    path('products/images/<str:name>/', image_views.product_image, name='product-image'),
     
     # Cart 
     path('cart/', views.get_cart, name='get-cart'),
@@ -64,14 +69,19 @@ urlpatterns = [
     path('admin/analytics/sales-prediction/', views.sales_prediction, name='sales-prediction'),
     path('admin/analytics/revenue-refunds/', revenue_refund_views.revenue_refund_analytics, name='revenue-refunds'),
     path('admin/analytics/dashboard/', views.admin_analytics_dashboard, name='admin-analytics-dashboard'),
+    path('admin/analytics/searches/', views.admin_search_analytics, name='admin-search-analytics'),
     
     # Admin - PARTIALLY USED
     path('admin/analytics/stats/', views.admin_stats, name='admin-stats'),  # USED ✓ - Dashboard stats
     path('admin/products/', views.admin_products, name='admin-products'),
     path('admin/products/create/', views.admin_create_product, name='admin-create-product'),
+    path('admin/products/import/', views.admin_import_products, name='admin-import-products'),
+    path('admin/products/bulk-update/', views.admin_bulk_update_products, name='admin-bulk-update-products'),
+    path('admin/products/export/', views.admin_export_products, name='admin-export-products'),
     path('admin/products/update/<int:product_id>/', views.admin_update_product, name='admin-update-product'),
     path('admin/products/delete/<int:product_id>/', views.admin_delete_product, name='admin-delete-product'),
     path('admin/products/toggle/<int:product_id>/', views.admin_toggle_product_availability, name='admin-toggle-product'),
+    path('admin/products/<int:product_id>/video/', video_views.admin_product_video, name='admin-product-video'),
     path('admin/users/', views.admin_users, name='admin-users'),
     path('admin/users/create/', views.admin_create_user, name='admin-create-user'),
     path('admin/users/update/<int:user_id>/', views.admin_update_user, name='admin-update-user'),
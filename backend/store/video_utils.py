@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from django.core.files import File
+
+VIDEO_CHUNK_SIZE = 64 * 1024
+DEFAULT_VIDEO_EXTENSION = '.mp4'
+
+DATA_URL_PATTERN = re.compile(r'^data:(?P<mime>[\w.+-]+/[\w.+-]+)?(?:;[\w=.-]+)*;base64,', re.IGNORECASE)
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def video_extension(name=None, content_type=None):
+    extension = os.path.splitext(name or '')[1].lower()
+    if not extension and content_type:
+        extension = mimetypes.guess_extension(content_type) or ''
+    return extension or DEFAULT_VIDEO_EXTENSION
+
+def video_version(name):
+    """Content hash part of a stored video name, used as its ETag and URL version"""
+    return os.path.splitext(os.path.basename(name))[0].rsplit('-', 1)[-1]
+
+def save_product_video(product, content, extension):
+    """Store a video file for the product under a content-hashed name and drop any previous one"""
+    digest = hashlib.sha256()
+    for chunk in content.chunks(VIDEO_CHUNK_SIZE):
+        digest.update(chunk)
+    content.seek(0)
+    name = f'{product.id}-{digest.hexdigest()[:16]}{extension}'
+
+    previous = product.video.name if product.video else None
+    if not previous or os.path.basename(previous) != name:
+        product.video.save(name, content, save=False)
+    product.video_file = ''
+    product.save(update_fields=['video', 'video_file', 'updated'])
+
+    if previous and previous != product.video.name:
+        product.video.storage.delete(previous)
+
+def delete_product_video(product):
+    if product.video:
+        product.video.delete(save=False)
+    product.video_file = ''
+    product.save(update_fields=['video', 'video_file', 'updated'])
+
+def decode_data_url(data):
+    """
+    Decode a base64 `data:` URL into a temporary file, a slice at a time
+    so the decoded video is never held in memory next to the encoded one.
+    Returns (file, extension), raises ValueError for anything else.
+    """
+    match = DATA_URL_PATTERN.match(data or '')
+    if not match:
+        raise ValueError('Not a base64 data URL')
+
+    output = tempfile.TemporaryFile()
+    step = VIDEO_CHUNK_SIZE * 4  # Whole base64 quads only
+    try:
+        for start in range(match.end(), len(data), step):
+            output.write(base64.b64decode(data[start:start + step]))
+    except ValueError:
+        output.close()
+        raise ValueError('Invalid base64 video data')
+    output.seek(0)
+    return File(output), video_extension(content_type=match.group('mime'))
+
+def apply_video_payload(product, upload=None, data=None):
+    """
+    Apply a video from a create/update request: a multipart `video` upload,
+    or a legacy base64 data URL in `video_file`. An empty `video_file`
+    removes the video; any other value (the streaming URL echoed back) is ignored.
+    """
+    if upload is not None:
+        save_product_video(product, upload, video_extension(upload.name, upload.content_type))
+    elif data == '':
+        if product.video:
+            delete_product_video(product)
+    elif isinstance(data, str) and data.startswith('data:'):
+        content, extension = decode_data_url(data)
+        with content:
+            save_product_video(product, content, extension)
+
+def parse_range(header, size):
+    """
+    (start, end) byte positions, inclusive, for a single `Range` header.
+    None means serve the whole file: no header, or one we don't handle
+    (multiple ranges). Raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_PATTERN.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range - the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Unsatisfiable range')
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Unsatisfiable range')
+    return start, end
+
+def read_file_range(file, start, length):
+    """Yield `length` bytes of an open file from `start`, closing it when done"""
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(VIDEO_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
@@ -0,0 +1,101 @@
+import mimetypes
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import http_date
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .models import Product
+from .serializers import ProductSerializer
+from .video_utils import (
+    delete_product_video, parse_range, read_file_range, save_product_video,
+    video_extension, video_version
+)
+
+# Video URLs carry the content hash, so a versioned URL never changes
+VERSIONED_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+UNVERSIONED_CACHE_CONTROL = 'public, max-age=3600'
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def stream_product_video(request, product_id):
+    """Serve a product video with HTTP Range support for seeking"""
+    product = get_object_or_404(Product.objects.only('id', 'video'), id=product_id)
+    if not product.video:
+        raise Http404('No video for this product')
+
+    storage = product.video.storage
+    name = product.video.name
+    try:
+        size = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except (OSError, NotImplementedError):
+        raise Http404('Video file missing')
+
+    version = video_version(name)
+    headers = {
+        'ETag': f'"{version}"',
+        'Last-Modified': http_date(modified.timestamp()),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': VERSIONED_CACHE_CONTROL if request.GET.get('v') == version else UNVERSIONED_CACHE_CONTROL,
+    }
+
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return HttpResponse(status=304, headers=headers)
+
+    # A stale If-Range validator means the client must take the whole file
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == headers['ETag']:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            headers['Content-Range'] = f'bytes */{size}'
+            return HttpResponse(status=416, headers=headers)
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if byte_range is None:
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            read_file_range(storage.open(name, 'rb'), start, length),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+@api_view(['POST', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def admin_product_video(request, product_id):
+    """Upload (multipart `video` field) or remove a product's video"""
+    if not request.user.is_staff:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        product = get_object_or_404(Product, id=product_id)
+
+        if request.method == 'DELETE':
+            delete_product_video(product)
+            return Response({'message': 'Video removed'})
+
+        upload = request.FILES.get('video')
+        if not upload:
+            return Response({'error': 'No video file provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.content_type and not upload.content_type.startswith('video/'):
+            return Response({'error': 'File must be a video'}, status=status.HTTP_400_BAD_REQUEST)
+
+        save_product_video(product, upload, video_extension(upload.name, upload.content_type))
+        serializer = ProductSerializer(product, context={'request': request})
+        return Response(serializer.data)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
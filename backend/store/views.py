@@ -1,19 +1,27 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, Min, Max
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.contrib.auth.models import User
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 import uuid
 
-from .models import Category, Product, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Compare, Offer, SearchQuery
+from .models import Category, Product, Cart, CartItem, Wishlist, Order, OrderItem, Review, UserProfile, Compare, Offer
 from .serializers import (
     CategorySerializer, ProductSerializer, CartSerializer, CartItemSerializer,
     WishlistSerializer, OrderSerializer, ReviewSerializer, UserProfileSerializer,
-    UserRegistrationSerializer, UserSerializer, CompareSerializer, OfferSerializer
+    UserRegistrationSerializer, UserSerializer, CompareSerializer, OfferSerializer,
+    ProductCardSerializer, WishlistCardSerializer, PRODUCT_CARD_FIELDS, get_product_fields, deferred_product_columns
 )
 from .analytics import get_analytics_data
 
@@ -21,6 +29,27 @@ from .analytics import get_analytics_data
 # from .views_combo_eligibility import check_combo_eligibility
 from .stock_utils import update_checkout_stock
 from .product_utils import admin_toggle_product_availability
+from .search_index import cached_ranking, rank_products
+from .product_filters import apply_product_filters, compute_facets, get_sort_ordering, has_search
+from .filter_engine import filter_engine
+from .autocomplete import suggestion_index
+from .spelling import spelling_corrector
+from .search_events import search_event_buffer
+from .search_rollup import popular_search_terms
+from .search_analytics import search_analytics_report, DEFAULT_REPORT_DAYS, DEFAULT_REPORT_LIMIT, MAX_REPORT_DAYS, MAX_REPORT_LIMIT
+from .pagination import KeysetPagination
+from .video_utils import apply_video_payload
+from .product_import import ProductImporter, import_format, read_rows
+from .product_bulk import bulk_update_products, MAX_BULK_UPDATE_ROWS
+from .slugs import allocate_slug, slug_matches
+from .avatars import avatar_pipeline, stage_profile_picture
+from .product_cards import card_page, load_cards
+from .product_export import EXPORT_FORMATS, export_columns, export_rows, parquet_available, stream_export
+from .catalog_cache import cached_response, CATALOG_CACHE_TIMEOUT
+from .conditional import (
+    active_offers_etag, category_list_etag, product_by_id_etag, product_by_id_last_modified,
+    product_detail_etag, product_detail_last_modified
+)
 
 # Authentication Views
 @api_view(['POST'])
@@ -64,98 +93,124 @@ def login(request):
     return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 # Category Views
+@method_decorator(cache_control(public=True, max_age=300), name='dispatch')
+@method_decorator(condition(etag_func=category_list_etag), name='dispatch')
 class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, 'categories', lambda: super(CategoryListView, self).list(request, *args, **kwargs))
 
 # Product Views
 class ProductListView(generics.ListAPIView):
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
-    pagination_class = None
+    pagination_class = KeysetPagination
+    ranking = None
+    matches = None
     
-    def get_queryset(self):
-        queryset = Product.objects.filter(available=True)
-        
-        # Basic filters
-        category_slug = self.request.query_params.get('category')
-        search = self.request.query_params.get('search')
-        limit = self.request.query_params.get('limit')
-        
-        # Advanced filters
-        min_price = self.request.query_params.get('min_price')
-        max_price = self.request.query_params.get('max_price')
-        brand = self.request.query_params.get('brand')
-        min_rating = self.request.query_params.get('min_rating')
-        sort_by = self.request.query_params.get('sort_by', 'name')
-        in_stock = self.request.query_params.get('in_stock')
-        
-        # Category filter
-        if category_slug:
-            queryset = queryset.filter(
-                Q(category__slug=category_slug) | 
-                Q(category__name__icontains=category_slug.replace('-', ' '))
-            )
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, 'products', lambda: self.search_list(request, *args, **kwargs))
+    
+    def search_list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        params = request.query_params
         
-        # Enhanced search
-        if search:
-            search_terms = search.split()
-            search_query = Q()
-            for term in search_terms:
-                search_query |= (
-                    Q(name__icontains=term) |
-                    Q(description__icontains=term) |
-                    Q(brand__icontains=term) |
-                    Q(category__name__icontains=term) |
-                    Q(specifications__icontains=term)
-                )
-            queryset = queryset.filter(search_query).distinct()
-        
-        # Price range filter
-        if min_price:
-            queryset = queryset.filter(price__gte=min_price)
-        if max_price:
-            queryset = queryset.filter(price__lte=max_price)
-        
-        # Brand filter
-        if brand:
-            brands = brand.split(',')
-            queryset = queryset.filter(brand__in=brands)
-        
-        # Stock filter
-        if in_stock == 'true':
-            queryset = queryset.filter(stock__gt=0)
-        elif in_stock == 'false':
-            queryset = queryset.filter(stock=0)
-        
-        # Sorting
-        if sort_by == 'price_low':
-            queryset = queryset.order_by('price')
-        elif sort_by == 'price_high':
-            queryset = queryset.order_by('-price')
-        elif sort_by == 'newest':
-            queryset = queryset.order_by('-created')
-        elif sort_by == 'rating':
-            # This would need a more complex query for actual rating calculation
-            queryset = queryset.order_by('-id')  # Placeholder
-        else:
-            queryset = queryset.order_by('name')
-        
-        # Limit results
-        if limit:
+        # "Did you mean" for searches with no results
+        if has_search(params) and not params.get('cursor') and not response.data.get('results'):
             try:
-                queryset = queryset[:int(limit)]
-            except ValueError:
-                pass
-                
+                correction = spelling_corrector.correct(params['search'])
+                if correction:
+                    response.data['did_you_mean'] = self.get_correction(correction, params)
+            except Exception as e:
+                print(f"Spelling correction error: {e}")
+        return response
+    
+    def get_correction(self, correction, params):
+        suggestion = {'query': correction}
+        
+        # With autocorrect=true the first page of the corrected search is included
+        if params.get('autocorrect') == 'true':
+            corrected = params.copy()
+            corrected['search'] = correction
+            queryset = apply_product_filters(Product.objects.filter(available=True).select_related('category'), corrected)
+            ranking = rank_products(correction, queryset.values('id'))[:self.paginator.page_size]
+            objects = queryset.in_bulk([product_id for product_id, _ in ranking])
+            products = [objects[product_id] for product_id, _ in ranking if product_id in objects]
+            if self.use_cards():
+                products = card_page(products)
+            suggestion['results'] = self.get_serializer(products, many=True).data
+        return suggestion
+    
+    def use_cards(self):
+        # The default card projection is read from the product card table
+        params = self.request.query_params
+        return not params.get('fields') and not params.get('exclude')
+    
+    def get_serializer_class(self):
+        return ProductCardSerializer if self.use_cards() else ProductSerializer
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.use_cards():
+            return card_page(page)
+        return page
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = apply_product_filters(Product.objects.filter(available=True).select_related('category'), params)
+        
+        search = params.get('search')
+        sort_by = params.get('sort_by') or ('relevance' if search else 'name')
+        
+        # Relevance ranking - BM25 scores computed from the search index once
+        # per query and filters, the paginator loads only the requested page of it
+        if sort_by == 'relevance' and has_search(params):
+            self.ranking = cached_ranking(search, queryset.values('id'), params)
+            return queryset
+        
+        queryset = queryset.order_by(*get_sort_ordering(sort_by))
+        
+        # Filter and sort in memory when the engine can answer the request,
+        # the paginator then loads only the page; the queryset stays the fallback
+        self.matches = filter_engine.query(params, sort_by)
         return queryset
-
+    
+    def get_product_fields(self):
+        # Card projection unless the client asks for other fields
+        if not hasattr(self, '_product_fields'):
+            self._product_fields = get_product_fields(self.request.query_params, PRODUCT_CARD_FIELDS)
+        return self._product_fields
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['product_fields'] = self.get_product_fields()
+        return context
+    
+    def filter_queryset(self, queryset):
+        # Load only the columns the selected fields need; sort columns stay
+        # loaded because the paginator reads them for the cursor. Pages of
+        # cards need nothing but the ids from the product table.
+        fields = ['id'] if self.use_cards() else self.get_product_fields()
+        ordering = {str(field).lstrip('-') for field in queryset.query.order_by}
+        if 'category' not in fields:
+            queryset = queryset.select_related(None)
+        return queryset.defer(*[
+            column for column in deferred_product_columns(fields) if column not in ordering
+        ])
+
+@method_decorator(cache_control(public=True, max_age=60), name='dispatch')
+@method_decorator(condition(etag_func=product_detail_etag, last_modified_func=product_detail_last_modified), name='dispatch')
 class ProductDetailView(generics.RetrieveAPIView):
     queryset = Product.objects.filter(available=True)
     serializer_class = ProductSerializer
     lookup_field = 'slug'
     permission_classes = [AllowAny]
+    
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(request, 'product', lambda: super(ProductDetailView, self).retrieve(request, *args, **kwargs))
 
 # Cart Views
 @api_view(['GET'])
@@ -238,8 +293,20 @@ def remove_from_cart(request, item_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_wishlist(request):
-    wishlist_items = Wishlist.objects.filter(user=request.user)
-    serializer = WishlistSerializer(wishlist_items, many=True)
+    params = request.query_params
+    if not params.get('fields') and not params.get('exclude'):
+        # Default projection, from the product card table
+        wishlist_items = list(Wishlist.objects.filter(user=request.user))
+        cards = load_cards(item.product_id for item in wishlist_items)
+        for item in wishlist_items:
+            item.card = cards.get(item.product_id)
+        return Response(WishlistCardSerializer(wishlist_items, many=True, context={'request': request}).data)
+    
+    fields = get_product_fields(params, PRODUCT_CARD_FIELDS)
+    wishlist_items = Wishlist.objects.filter(user=request.user).select_related(
+        'product__category' if 'category' in fields else 'product'
+    ).defer(*deferred_product_columns(fields, prefix='product__'))
+    serializer = WishlistSerializer(wishlist_items, many=True, context={'product_fields': fields})
     return Response(serializer.data)
 
 @api_view(['POST'])
@@ -451,6 +518,15 @@ def user_profile(request):
         return Response(serializer.data)
     
     elif request.method == 'PUT':
+        # Handle profile image upload - resized by the avatar worker, a placeholder is served until then
+        update_fields = []
+        if 'profile_image' in request.FILES:
+            try:
+                stage_profile_picture(profile, request.FILES['profile_image'])
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            update_fields.append('profile_picture_pending')
+        
         # Update user fields
         user = request.user
         if 'first_name' in request.data:
@@ -463,25 +539,17 @@ def user_profile(request):
             user.email = request.data['email']
         user.save()
         
-        # Handle profile image upload
-        if 'profile_image' in request.FILES:
-            profile.profile_picture = request.FILES['profile_image']
-        
         # Update other profile fields
-        if 'phone' in request.data:
-            profile.phone = request.data['phone']
-        if 'address' in request.data:
-            profile.address = request.data['address']
-        if 'city' in request.data:
-            profile.city = request.data['city']
-        if 'state' in request.data:
-            profile.state = request.data['state']
-        if 'pincode' in request.data:
-            profile.pincode = request.data['pincode']
-        if 'date_of_birth' in request.data:
-            profile.date_of_birth = request.data['date_of_birth']
-        
-        profile.save()
+        for field in ['phone', 'address', 'city', 'state', 'pincode', 'date_of_birth']:
+            if field in request.data:
+                setattr(profile, field, request.data[field])
+                update_fields.append(field)
+        
+        # Only the changed fields, so a picture the worker swapped in meanwhile isn't overwritten
+        if update_fields:
+            profile.save(update_fields=update_fields)
+        if 'profile_picture_pending' in update_fields:
+            transaction.on_commit(lambda: avatar_pipeline.submit(profile.id))
         
         # Return updated profile with user data
         updated_profile = UserProfileSerializer(profile).data
@@ -582,8 +650,8 @@ def refund_analytics(request):
         'monthly_refunds': list(reversed(monthly_refunds))
     })
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
+# @api_view(['GET'])
+# @permission_classes([AllowAny])
 # def get_home_recommendations(request):
 #     """Get multiple types of recommendations for home page"""
 #     import sys
@@ -630,13 +698,16 @@ def refund_analytics(request):
 
 
 
+# Cart prices and stock must be current, so always revalidate - a 304 is cheap
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=product_by_id_etag, last_modified_func=product_by_id_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def product_by_id(request, product_id):
     """Get product by ID - used by cart context"""
     try:
         product = get_object_or_404(Product, id=product_id)
-        serializer = ProductSerializer(product)
+        serializer = ProductSerializer(product, context={'request': request})
         return Response(serializer.data)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
@@ -756,7 +827,7 @@ def admin_products(request):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     products = Product.objects.all()
-    serializer = ProductSerializer(products, many=True)
+    serializer = ProductSerializer(products, many=True, context={'request': request})
     return Response(serializer.data)
 
 @api_view(['POST'])
@@ -776,12 +847,7 @@ def admin_create_product(request):
                 return Response({'error': f'Category {category_slug} not found'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate unique slug
-        base_slug = request.data.get('name', '').lower().replace(' ', '-').replace('--', '-')
-        slug = base_slug
-        counter = 1
-        while Product.objects.filter(slug=slug).exists():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
+        slug = allocate_slug(request.data.get('name', ''))
         
         # Handle multiple images
         image_urls = []
@@ -801,18 +867,102 @@ def admin_create_product(request):
             exchange_available=request.data.get('exchange_available', False),
             exchange_discount=request.data.get('exchange_discount', 0),
             stock=int(request.data.get('stock', 0)),
+            image=request.FILES.get('image'),
             image_url=request.data.get('image_url', ''),
             image_urls=request.data.get('image_urls', []),
             video_url=request.data.get('video_url', ''),
-            video_file=request.data.get('video_file', ''),
             available=True
         )
         
-        serializer = ProductSerializer(product)
+        # Videos are stored as files, never in the product row
+        apply_video_payload(product, request.FILES.get('video'), request.data.get('video_file'))
+        
+        serializer = ProductSerializer(product, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def admin_import_products(request):
+    """Create and update products from an uploaded CSV or JSONL file, with a report per row"""
+    if not request.user.is_staff:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'A CSV or JSONL file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        fmt = import_format(upload.name, request.data.get('format'))
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        importer = ProductImporter(dry_run=dry_run)
+        rows = list(importer.run(read_rows(upload, fmt)))
+        return Response({
+            'dry_run': dry_run,
+            'summary': importer.summary,
+            'rows': rows
+        })
+    except Exception as e:
+        print(f"Product import error: {e}")
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def admin_bulk_update_products(request):
+    """Update price, stock and availability of many products at once, with a report per change"""
+    if not request.user.is_staff:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    
+    rows = request.data.get('products') if isinstance(request.data, dict) else request.data
+    if not isinstance(rows, list) or not rows:
+        return Response({'error': 'A non-empty list of product changes is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(rows) > MAX_BULK_UPDATE_ROWS:
+        return Response({'error': f'At most {MAX_BULK_UPDATE_ROWS} products can be updated at once'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        summary, reports = bulk_update_products(rows)
+        return Response({'summary': summary, 'rows': reports})
+    except Exception as e:
+        print(f"Bulk product update error: {e}")
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_export_products(request):
+    """
+    Stream the catalog as CSV, JSONL or Parquet (file_format param). Takes the
+    product list filters plus `available`, and a comma separated `columns` list.
+    """
+    if not request.user.is_staff:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+
+    # `format` is taken by DRF's format suffixes
+    fmt = request.query_params.get('file_format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return Response({'error': f"Unsupported export format '{fmt}', use one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    if fmt == 'parquet' and not parquet_available():
+        return Response({'error': 'Parquet export requires pyarrow to be installed'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        columns = export_columns(request.query_params.get('columns'))
+        products = apply_product_filters(Product.objects.all(), request.query_params)
+        available = request.query_params.get('available')
+        if available in ('true', 'false'):
+            products = products.filter(available=available == 'true')
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(
+        stream_export(export_rows(products, columns), columns, fmt),
+        content_type=EXPORT_FORMATS[fmt]
+    )
+    filename = f"products-{timezone.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def admin_update_product(request, product_id):
@@ -823,21 +973,17 @@ def admin_update_product(request, product_id):
         product = get_object_or_404(Product, id=product_id)
         
         # Update name and slug
-        if 'name' in request.data:
+        if 'name' in request.data and request.data['name'] != product.name:
             product.name = request.data['name']
-            base_slug = request.data['name'].lower().replace(' ', '-').replace('--', '-')
-            # Ensure unique slug
-            slug = base_slug
-            counter = 1
-            while Product.objects.filter(slug=slug).exclude(id=product_id).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            product.slug = slug
+            # A new slug only for a renamed product whose slug no longer fits its name;
+            # hand-set slugs are kept while the name stays, so product URLs don't break
+            if not slug_matches(product.slug, product.name):
+                product.slug = allocate_slug(product.name)
         
         # Update other fields
         for field in ['description', 'price', 'actual_price', 'discount_percentage', 
                      'offer_text', 'exchange_available', 'exchange_discount', 
-                     'stock', 'image_url', 'image_urls', 'video_url', 'video_file']:
+                     'stock', 'image_url', 'image_urls', 'video_url']:
             if field in request.data:
                 setattr(product, field, request.data[field])
         
@@ -849,8 +995,13 @@ def admin_update_product(request, product_id):
             except Category.DoesNotExist:
                 pass
         
+        # Uploaded image, resized into derivatives after the save
+        if 'image' in request.FILES:
+            product.image = request.FILES['image']
+        
         product.save()
-        serializer = ProductSerializer(product)
+        apply_video_payload(product, request.FILES.get('video'), request.data.get('video_file'))
+        serializer = ProductSerializer(product, context={'request': request})
         return Response(serializer.data)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -1137,9 +1288,27 @@ def admin_remove_compare(request, compare_id):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 # Offer Management Views
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=active_offers_etag)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_active_offers(request):
+    # Cached until the next offer starts or ends, whichever comes first
+    return cached_response(request, 'offers', _active_offers_response, timeout=_seconds_until_offer_change)
+
+def _seconds_until_offer_change(response):
+    from django.utils import timezone
+    now = timezone.now()
+    boundaries = Offer.objects.filter(is_active=True).aggregate(
+        next_start=Min('start_date', filter=Q(start_date__gt=now)),
+        next_end=Min('end_date', filter=Q(end_date__gt=now))
+    )
+    upcoming = [boundary for boundary in boundaries.values() if boundary]
+    if not upcoming:
+        return CATALOG_CACHE_TIMEOUT
+    return min(CATALOG_CACHE_TIMEOUT, int((min(upcoming) - now).total_seconds()))
+
+def _active_offers_response():
     from django.utils import timezone
     now = timezone.now()
     
@@ -1925,28 +2094,8 @@ def search_suggestions(request):
         if len(query) < 2:
             return Response({'products': [], 'brands': [], 'categories': []})
         
-        # Product name suggestions
-        product_suggestions = Product.objects.filter(
-            name__icontains=query, available=True
-        ).values_list('name', flat=True).distinct()[:5]
-        
-        # Brand suggestions
-        brand_suggestions = Product.objects.filter(
-            brand__icontains=query, available=True
-        ).exclude(brand__isnull=True).exclude(brand__exact='').values_list('brand', flat=True).distinct()[:3]
-        
-        # Category suggestions
-        category_suggestions = Category.objects.filter(
-            name__icontains=query
-        ).values_list('name', flat=True).distinct()[:3]
-        
-        suggestions = {
-            'products': list(product_suggestions),
-            'brands': list(filter(None, brand_suggestions)),  # Remove empty brands
-            'categories': list(category_suggestions)
-        }
-        
-        return Response(suggestions)
+        # Served from the in-memory prefix index, no database access
+        return Response(suggestion_index.suggest(query))
     except Exception as e:
         print(f"Search suggestions error: {e}")
         return Response({'products': [], 'brands': [], 'categories': []})
@@ -1955,20 +2104,8 @@ def search_suggestions(request):
 @permission_classes([AllowAny])
 def popular_searches(request):
     try:
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db import models
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        popular = SearchQuery.objects.filter(
-            created_at__gte=thirty_days_ago,
-            results_count__gt=0  # Only include searches that returned results
-        ).values('query').annotate(
-            search_count=models.Count('query')
-        ).order_by('-search_count')[:10]
-        
-        popular_queries = [item['query'] for item in popular]
+        # Served from the daily rollup, cached briefly
+        popular_queries = popular_search_terms()
         
         # If no popular searches, return some default suggestions
         if not popular_queries:
@@ -1980,15 +2117,43 @@ def popular_searches(request):
         # Return default popular searches on error
         return Response(['smartphones', 'laptops', 'headphones', 'cameras', 'gaming'])
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_search_analytics(request):
+    """Zero-result and low-result searches with trends and the closest catalog terms"""
+    if not request.user.is_staff:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        days = min(max(int(request.query_params.get('days', DEFAULT_REPORT_DAYS)), 1), MAX_REPORT_DAYS)
+        limit = min(max(int(request.query_params.get('limit', DEFAULT_REPORT_LIMIT)), 1), MAX_REPORT_LIMIT)
+    except ValueError:
+        return Response({'error': 'days and limit must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        return Response(search_analytics_report(days=days, limit=limit))
+    except Exception as e:
+        print(f"Search analytics error: {e}")
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def product_facets(request):
+    """Brand, category, price bucket and stock counts for the product list filters"""
+    return cached_response(request, 'facets', lambda: Response(compute_facets(request.query_params)))
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def search_filters(request):
+    return cached_response(request, 'search_filters', _search_filters_response)
+
+def _search_filters_response():
     brands = Product.objects.filter(available=True).values_list('brand', flat=True).distinct()
     categories = Category.objects.all().values('id', 'name', 'slug')
     
     price_range = Product.objects.filter(available=True).aggregate(
-        min_price=models.Min('price'),
-        max_price=models.Max('price')
+        min_price=Min('price'),
+        max_price=Max('price')
     )
     
     return Response({
@@ -2000,13 +2165,17 @@ def search_filters(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def track_search(request):
-    query = request.data.get('query', '').strip()
-    results_count = request.data.get('results_count', 0)
+    query = request.data.get('query', '').strip()[:255]
+    try:
+        results_count = max(int(request.data.get('results_count', 0)), 0)
+    except (TypeError, ValueError):
+        results_count = 0
     
+    # Buffered and written in batches, see search_events.py
     if query:
-        SearchQuery.objects.create(
-            query=query,
-            user=request.user if request.user.is_authenticated else None,
+        search_event_buffer.add(
+            query,
+            user_id=request.user.id if request.user.is_authenticated else None,
             results_count=results_count,
             ip_address=request.META.get('REMOTE_ADDR')
         )
@@ -30,6 +30,7 @@ const AdminAnalytics = () => {
   const [salesData, setSalesData] = useState(null);
   const [revenueData, setRevenueData] = useState(null);
   const [refundData, setRefundData] = useState(null);
+  const [searchReport, setSearchReport] = useState(null);
 
   const [realTimeData, setRealTimeData] = useState({
     orders: [],
@@ -40,8 +41,23 @@ const AdminAnalytics = () => {
 
   useEffect(() => {
     fetchDashboardData();
+    fetchSearchReport();
   }, []);
 
+  const fetchSearchReport = async () => {
+    try {
+      const response = await analyticsAPI.getSearchAnalytics({ days: 30, limit: 10 });
+      setSearchReport(response.data);
+    } catch (error) {
+      console.error("Error fetching search analytics:", error);
+    }
+  };
+
+  const formatTrend = (trend) => {
+    if (trend === null || trend === undefined) return "new";
+    return `${trend > 0 ? "+" : ""}${trend}%`;
+  };
+
   const fetchDashboardData = async () => {
     try {
       console.log("Fetching dashboard data...");
@@ -848,6 +864,61 @@ const AdminAnalytics = () => {
           </div>
         </div>
       </div>
+
+      {/* Failed Searches */}
+      {searchReport && (
+        <div className="row g-3 mt-1">
+          {[
+            { key: "zero_result_queries", title: "Zero-Result Searches", color: "bg-danger" },
+            { key: "low_result_queries", title: "Low-Result Searches", color: "bg-warning" },
+          ].map(({ key, title, color }) => (
+            <div className="col-12 col-lg-6" key={key}>
+              <div
+                className="card chart-card border-0 shadow-sm"
+                style={{ borderRadius: "12px", height: "100%" }}
+              >
+                <div
+                  className={`card-header ${color} text-white`}
+                  style={{ borderRadius: "12px 12px 0 0" }}
+                >
+                  <h6 className="mb-0 fw-semibold">
+                    <i className="fas fa-search me-2"></i>
+                    {title} (last {searchReport.period.days} days)
+                  </h6>
+                </div>
+                <div className="card-body p-3">
+                  {searchReport[key].length === 0 ? (
+                    <p className="text-muted mb-0">No searches to report</p>
+                  ) : (
+                    <table className="table table-sm mb-0">
+                      <thead>
+                        <tr>
+                          <th>Query</th>
+                          <th>Count</th>
+                          <th>Rate</th>
+                          <th>Trend</th>
+                          <th>Closest terms</th>
+                        </tr>
+                      </thead>
+                      <tbody>
+                        {searchReport[key].map((row) => (
+                          <tr key={row.query}>
+                            <td>{row.query}</td>
+                            <td>{row.count} / {row.searches}</td>
+                            <td>{row.rate}%</td>
+                            <td>{formatTrend(row.trend)}</td>
+                            <td>{row.closest_terms.join(", ") || "-"}</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  )}
+                </div>
+              </div>
+            </div>
+          ))}
+        </div>
+      )}
     </>
   );
 };
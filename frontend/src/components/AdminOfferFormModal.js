@@ -105,11 +105,17 @@ const AdminOfferFormModal = ({
 
   const fetchProducts = async () => {
     try {
-      const response = await fetch(`${process.env.REACT_APP_API_URL || 'http://localhost:8000/api'}/products/`);
-      if (response.ok) {
+      // Product list is cursor paginated - follow the next links to get every product
+      let nextUrl = `${process.env.REACT_APP_API_URL || 'http://localhost:8000/api'}/products/?page_size=100`;
+      let allProducts = [];
+      while (nextUrl) {
+        const response = await fetch(nextUrl);
+        if (!response.ok) break;
         const data = await response.json();
-        setProducts(data.results || data);
+        allProducts = [...allProducts, ...(data.results || data)];
+        nextUrl = data.next || null;
       }
+      setProducts(allProducts);
     } catch (error) {
       console.error("Error fetching products:", error);
     }
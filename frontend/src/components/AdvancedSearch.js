@@ -11,35 +11,21 @@ const AdvancedSearch = ({ onClose }) => {
     maxPrice: '',
     minRating: '',
     inStock: '',
-    sortBy: 'name'
+    sortBy: 'relevance'
   });
   
-  const [filterOptions, setFilterOptions] = useState({
+  // Facet counts for the current filters
+  const [facets, setFacets] = useState({
     brands: [],
     categories: [],
-    priceRange: { min_price: 0, max_price: 100000 }
+    stock: { in_stock: 0, out_of_stock: 0 },
+    total: 0
   });
+  const facetTimer = useRef(null);
   
   const navigate = useNavigate();
 
-  useEffect(() => {
-    fetchFilterOptions();
-  }, []);
-
-  const fetchFilterOptions = async () => {
-    try {
-      const response = await api.get('/search/filters/');
-      setFilterOptions(response.data);
-    } catch (error) {
-      console.error('Error fetching filter options:', error);
-    }
-  };
-
-  const handleFilterChange = (key, value) => {
-    setFilters(prev => ({ ...prev, [key]: value }));
-  };
-
-  const handleSearch = () => {
+  const buildSearchParams = () => {
     const searchParams = new URLSearchParams();
     
     Object.entries(filters).forEach(([key, value]) => {
@@ -53,8 +39,34 @@ const AdvancedSearch = ({ onClose }) => {
         else searchParams.set(key, value);
       }
     });
+    return searchParams;
+  };
+
+  useEffect(() => {
+    // Debounced so typing doesn't fire a request per keystroke
+    clearTimeout(facetTimer.current);
+    facetTimer.current = setTimeout(fetchFacets, 250);
+    return () => clearTimeout(facetTimer.current);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [filters]);
+
+  const fetchFacets = async () => {
+    try {
+      const searchParams = buildSearchParams();
+      searchParams.delete('sort_by');
+      const response = await api.get(`/products/facets/?${searchParams.toString()}`);
+      setFacets(response.data);
+    } catch (error) {
+      console.error('Error fetching facets:', error);
+    }
+  };
+
+  const handleFilterChange = (key, value) => {
+    setFilters(prev => ({ ...prev, [key]: value }));
+  };
 
-    navigate(`/products?${searchParams.toString()}`);
+  const handleSearch = () => {
+    navigate(`/products?${buildSearchParams().toString()}`);
     onClose();
   };
 
@@ -67,7 +79,7 @@ const AdvancedSearch = ({ onClose }) => {
       maxPrice: '',
       minRating: '',
       inStock: '',
-      sortBy: 'name'
+      sortBy: 'relevance'
     });
   };
 
@@ -104,8 +116,8 @@ const AdvancedSearch = ({ onClose }) => {
                 onChange={(e) => handleFilterChange('category', e.target.value)}
               >
                 <option value="">All Categories</option>
-                {filterOptions.categories.map(cat => (
-                  <option key={cat.id} value={cat.slug}>{cat.name}</option>
+                {facets.categories.map(cat => (
+                  <option key={cat.slug} value={cat.slug}>{cat.name} ({cat.count})</option>
                 ))}
               </select>
             </div>
@@ -119,8 +131,8 @@ const AdvancedSearch = ({ onClose }) => {
                 onChange={(e) => handleFilterChange('brand', e.target.value)}
               >
                 <option value="">All Brands</option>
-                {filterOptions.brands.map(brand => (
-                  <option key={brand} value={brand}>{brand}</option>
+                {facets.brands.map(brand => (
+                  <option key={brand.value} value={brand.value}>{brand.value} ({brand.count})</option>
                 ))}
               </select>
             </div>
@@ -175,8 +187,8 @@ const AdvancedSearch = ({ onClose }) => {
                 onChange={(e) => handleFilterChange('inStock', e.target.value)}
               >
                 <option value="">All Products</option>
-                <option value="true">In Stock Only</option>
-                <option value="false">Out of Stock</option>
+                <option value="true">In Stock Only ({facets.stock.in_stock})</option>
+                <option value="false">Out of Stock ({facets.stock.out_of_stock})</option>
               </select>
             </div>
           </div>
@@ -189,6 +201,7 @@ const AdvancedSearch = ({ onClose }) => {
               value={filters.sortBy}
               onChange={(e) => handleFilterChange('sortBy', e.target.value)}
             >
+              <option value="relevance">Best Match</option>
               <option value="name">Name (A-Z)</option>
               <option value="price_low">Price: Low to High</option>
               <option value="price_high">Price: High to Low</option>
@@ -203,7 +216,7 @@ const AdvancedSearch = ({ onClose }) => {
             <i className="fas fa-eraser me-2"></i>Clear All
           </button>
           <button className="btn btn-primary" onClick={handleSearch}>
-            <i className="fas fa-search me-2"></i>Search Products
+            <i className="fas fa-search me-2"></i>Search Products ({facets.total})
           </button>
         </div>
       </div>
@@ -25,6 +25,8 @@ const ProductCard = ({ product, compact = false }) => {
   const { isAuthenticated } = useAuth();
   const { addToCart } = useCart();
   const { addToCompare, isInCompare } = useCompare();
+  // Product cards from the list endpoints carry in_stock rather than the stock count
+  const inStock = product.in_stock ?? product.stock > 0;
 
   const handleAddToCart = async (e) => {
     e.preventDefault();
@@ -38,7 +40,7 @@ const ProductCard = ({ product, compact = false }) => {
       return;
     }
     
-    if (product.stock <= 0) {
+    if (!inStock) {
       toast.error("This product is out of stock");
       return;
     }
@@ -126,7 +128,9 @@ const ProductCard = ({ product, compact = false }) => {
       <div className="product-image-wrapper position-relative">
         <Link to={`/products/${product.slug}`} className="d-block">
           <img
-            src={(product.image_urls && product.image_urls[0]) || product.image_url || "/api/placeholder/300/250"}
+            src={product.thumbnail || product.image_srcset?.card || (product.image_urls && product.image_urls[0]) || product.image_url || "/api/placeholder/300/250"}
+            srcSet={product.thumbnail_srcset || product.image_srcset?.srcset}
+            sizes={compact ? "160px" : "(max-width: 576px) 50vw, 300px"}
             className="product-image"
             alt={product.name}
             loading="lazy"
@@ -156,7 +160,7 @@ const ProductCard = ({ product, compact = false }) => {
 
         {/* Status badges */}
         <div className="product-badges">
-          {(product.stock === 0 || !product.available) && (
+          {(!inStock || !product.available) && (
             <span className="product-badge badge-danger">
               {!product.available ? 'Unavailable' : 'Out of Stock'}
             </span>
@@ -168,8 +172,16 @@ const ProductCard = ({ product, compact = false }) => {
           )}
         </div>
         
-        {/* Offers overlay on image */}
-        <ProductOffers product={product} />
+        {/* Offers overlay on image - cards already carry their best offer */}
+        {product.offer_badge !== undefined ? (
+          product.offer_badge && (
+            <div className="product-offers-overlay">
+              <span className="offers-count-span" title={product.offer_badge}>{product.offer_badge}</span>
+            </div>
+          )
+        ) : (
+          <ProductOffers product={product} />
+        )}
       </div>
 
       <div className="product-content">
@@ -252,7 +264,7 @@ const ProductCard = ({ product, compact = false }) => {
           <button
             className={`btn-wishlist ${isInWishlist ? 'active' : ''}`}
             onClick={handleToggleWishlist}
-            disabled={!product.available || product.stock === 0}
+            disabled={!product.available || !inStock}
             title={isInWishlist ? "Remove from Wishlist" : "Add to Wishlist"}
           >
             <i className={`fas fa-heart ${isInWishlist ? 'text-danger' : ''}`}></i>
@@ -261,12 +273,12 @@ const ProductCard = ({ product, compact = false }) => {
           <button
             className="btn-cart"
             onClick={handleAddToCart}
-            disabled={!product.available || product.stock === 0}
-            title={!product.available ? 'Unavailable' : product.stock === 0 ? 'Out of Stock' : 'Add to Cart'}
+            disabled={!product.available || !inStock}
+            title={!product.available ? 'Unavailable' : !inStock ? 'Out of Stock' : 'Add to Cart'}
           >
             <i className="fas fa-shopping-cart"></i>
             <span className="btn-text">
-              {!product.available ? 'Unavailable' : product.stock === 0 ? 'Out of Stock' : 'Buy'}
+              {!product.available ? 'Unavailable' : !inStock ? 'Out of Stock' : 'Buy'}
             </span>
           </button>
         </div>
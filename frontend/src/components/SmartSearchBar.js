@@ -62,15 +62,7 @@ const SmartSearchBar = ({ className = '' }) => {
   const handleSearch = async (searchQuery = query) => {
     if (!searchQuery.trim()) return;
 
-    // Track search
-    try {
-      await api.post('/search/track/', {
-        query: searchQuery,
-        results_count: 0 // Will be updated after search
-      });
-    } catch (error) {
-      console.error('Error tracking search:', error);
-    }
+    // The search is tracked by the products page once its results are known
 
     // Save to recent searches
     const recent = JSON.parse(localStorage.getItem('recentSearches') || '[]');
@@ -312,7 +312,6 @@ const Dashboard = () => {
         image_url: formData.image_url || "",
         image_urls: formData.image_urls || [],
         video_url: formData.video_url || "",
-        video_file: formData.video_file || "",
       };
 
       console.log(
@@ -322,16 +321,23 @@ const Dashboard = () => {
         parseFloat(formData.price)
       );
 
+      let response;
       if (editItem) {
-        const response = await adminAPI.updateProduct(editItem.id, payload);
+        response = await adminAPI.updateProduct(editItem.id, payload);
         console.log("Product updated:", response.data);
-        toast.success("Product updated successfully");
       } else {
-        const response = await adminAPI.createProduct(payload);
+        response = await adminAPI.createProduct(payload);
         console.log("Product created:", response.data);
-        toast.success("Product created successfully");
       }
 
+      // Videos go up as files, separately from the product JSON
+      if (formData.video_upload) {
+        await adminAPI.uploadProductVideo(response.data.id, formData.video_upload);
+      }
+      toast.success(
+        editItem ? "Product updated successfully" : "Product created successfully"
+      );
+
       setShowModal(false);
       setFormData({});
       fetchDashboardData();
@@ -2855,14 +2861,11 @@ const Dashboard = () => {
                           onChange={(e) => {
                             const file = e.target.files[0];
                             if (file) {
-                              const reader = new FileReader();
-                              reader.onload = (event) => {
-                                setFormData({
-                                  ...formData,
-                                  video_file: event.target.result,
-                                });
-                              };
-                              reader.readAsDataURL(file);
+                              setFormData({
+                                ...formData,
+                                video_file: URL.createObjectURL(file),
+                                video_upload: file,
+                              });
                             }
                           }}
                         />
@@ -3130,14 +3133,11 @@ const Dashboard = () => {
                           onChange={(e) => {
                             const file = e.target.files[0];
                             if (file) {
-                              const reader = new FileReader();
-                              reader.onload = (event) => {
-                                setFormData({
-                                  ...formData,
-                                  video_file: event.target.result,
-                                });
-                              };
-                              reader.readAsDataURL(file);
+                              setFormData({
+                                ...formData,
+                                video_file: URL.createObjectURL(file),
+                                video_upload: file,
+                              });
                             }
                           }}
                         />
@@ -3439,14 +3439,11 @@ const Dashboard = () => {
                               onChange={(e) => {
                                 const file = e.target.files[0];
                                 if (file) {
-                                  const reader = new FileReader();
-                                  reader.onload = (event) => {
-                                    setFormData({
-                                      ...formData,
-                                      video_file: event.target.result,
-                                    });
-                                  };
-                                  reader.readAsDataURL(file);
+                                  setFormData({
+                                    ...formData,
+                                    video_file: URL.createObjectURL(file),
+                                    video_upload: file,
+                                  });
                                 }
                               }}
                             />
@@ -9,9 +9,10 @@ const Products = () => {
   const [categories, setCategories] = useState([]);
   const [loading, setLoading] = useState(true);
   const [searchParams, setSearchParams] = useSearchParams();
-  const [currentPage, setCurrentPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [appliedFilters, setAppliedFilters] = useState({});
+  const [didYouMean, setDidYouMean] = useState(null);
 
   const category = searchParams.get('category') || '';
   const search = searchParams.get('search') || '';
@@ -19,15 +20,20 @@ const Products = () => {
   useEffect(() => {
     fetchProducts();
     fetchCategories();
-  }, [category, search, currentPage, appliedFilters]);
+  }, [category, search, appliedFilters]);
 
-  const fetchProducts = async () => {
+  const fetchProducts = async (cursor = null) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const params = {
         ...(category && { category }),
         ...(search && { search }),
-        ...appliedFilters
+        ...appliedFilters,
+        ...(cursor && { cursor })
       };
       
       const response = await productsAPI.getAll(params);
@@ -36,29 +42,30 @@ const Products = () => {
       let productList = [];
       if (data.results) {
         productList = data.results;
-        setTotalPages(Math.ceil(data.count / 12));
+        setNextCursor(data.next_cursor || null);
       } else if (Array.isArray(data)) {
         productList = data;
-        setTotalPages(1);
+        setNextCursor(null);
       }
       
-      // Additional client-side filtering for search
-      if (search && productList.length > 0) {
-        const searchLower = search.toLowerCase();
-        productList = productList.filter(product => 
-          product.name?.toLowerCase().includes(searchLower) ||
-          product.description?.toLowerCase().includes(searchLower) ||
-          product.brand?.toLowerCase().includes(searchLower) ||
-          product.category?.name?.toLowerCase().includes(searchLower)
-        );
+      setProducts(prev => cursor ? [...prev, ...productList] : productList);
+      if (!cursor) {
+        setDidYouMean(data.did_you_mean ? data.did_you_mean.query : null);
+        if (search) {
+          // Result counts feed the popular and zero-result search reports
+          productsAPI.trackSearch(search, productList.length).catch(error => {
+            console.error('Error tracking search:', error);
+          });
+        }
       }
-      
-      setProducts(productList);
     } catch (error) {
       console.error('Error fetching products:', error);
-      setProducts([]);
+      if (!cursor) {
+        setProducts([]);
+      }
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -116,12 +123,18 @@ const Products = () => {
       newParams.set('category', categorySlug);
     }
     setSearchParams(newParams);
-    setCurrentPage(1);
   };
 
-  const handlePageChange = (page) => {
-    setCurrentPage(page);
-    window.scrollTo(0, 0);
+  const handleSearchCorrection = (correction) => {
+    const newParams = new URLSearchParams(searchParams);
+    newParams.set('search', correction);
+    setSearchParams(newParams);
+  };
+
+  const handleLoadMore = () => {
+    if (nextCursor && !loadingMore) {
+      fetchProducts(nextCursor);
+    }
   };
 
   if (loading) {
@@ -140,6 +153,18 @@ const Products = () => {
                'All Products'}
             </h2>
             <p className="text-muted mb-0">{products.length} products found</p>
+            {didYouMean && (
+              <p className="text-muted mb-0">
+                Did you mean{' '}
+                <button
+                  type="button"
+                  className="btn btn-link p-0 align-baseline"
+                  onClick={() => handleSearchCorrection(didYouMean)}
+                >
+                  {didYouMean}
+                </button>?
+              </p>
+            )}
           </div>
           
           {/* Category Dropdown */}
@@ -232,49 +257,21 @@ const Products = () => {
                   ))
                 }
               </div>
-
-              {/* Pagination */}
-              {totalPages > 1 && (
-                <div className="pagination-container mt-5">
-                  <nav>
-                    <ul className="pagination justify-content-center">
-                      <li className={`page-item ${currentPage === 1 ? 'disabled' : ''}`}>
-                        <button
-                          className="page-link"
-                          onClick={() => handlePageChange(currentPage - 1)}
-                          disabled={currentPage === 1}
-                        >
-                          <i className="fas fa-chevron-left"></i>
-                        </button>
-                      </li>
-                      {[...Array(Math.min(5, totalPages))].map((_, index) => {
-                        const pageNum = Math.max(1, Math.min(totalPages - 4, currentPage - 2)) + index;
-                        return (
-                          <li key={pageNum} className={`page-item ${currentPage === pageNum ? 'active' : ''}`}>
-                            <button
-                              className="page-link"
-                              onClick={() => handlePageChange(pageNum)}
-                            >
-                              {pageNum}
-                            </button>
-                          </li>
-                        );
-                      })}
-                      <li className={`page-item ${currentPage === totalPages ? 'disabled' : ''}`}>
-                        <button
-                          className="page-link"
-                          onClick={() => handlePageChange(currentPage + 1)}
-                          disabled={currentPage === totalPages}
-                        >
-                          <i className="fas fa-chevron-right"></i>
-                        </button>
-                      </li>
-                    </ul>
-                  </nav>
-                </div>
-              )}
             </>
           )}
+
+          {/* Load More - the API pages with a cursor, so there is no page count */}
+          {nextCursor && products.length > 0 && (
+            <div className="text-center mt-5">
+              <button
+                className="btn btn-gradient px-4 py-2"
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? 'Loading...' : 'Load More'}
+              </button>
+            </div>
+          )}
         </div>
       </section>
     </div>
@@ -130,7 +130,7 @@ const Wishlist = () => {
               <div className="position-relative">
                 <Link to={`/products/${item.product.slug}`}>
                   <img
-                    src={item.product.image_url || '/api/placeholder/300/250'}
+                    src={item.product.thumbnail || item.product.image_url || '/api/placeholder/300/250'}
                     className="card-img-top"
                     alt={item.product.name}
                     style={{ height: '200px', objectFit: 'cover', borderRadius: '12px 12px 0 0' }}
@@ -151,7 +151,7 @@ const Wishlist = () => {
                   </Link>
                 </h6>
                 <p className="card-text text-muted small flex-grow-1 d-none d-md-block">
-                  {item.product.description?.substring(0, 80)}...
+                  {[item.product.brand, item.product.category?.name].filter(Boolean).join(' · ')}
                 </p>
                 <div className="d-flex justify-content-between align-items-center mb-2">
                   <h5 className="text-success mb-0 fw-bold">₹{(parseFloat(item.product.price) * 83).toFixed(0)}</h5>
@@ -51,6 +51,7 @@ export const authAPI = {
 export const productsAPI = {
   getAll: (params) => api.get('/products/', { params }),
   getBySlug: (slug) => api.get(`/products/${slug}/`),
+  trackSearch: (query, resultsCount) => api.post('/search/track/', { query, results_count: resultsCount }),
   getCategories: () => api.get('/categories/'),
 };
 
@@ -62,7 +63,7 @@ export const cartAPI = {
 };
 
 export const wishlistAPI = {
-  get: () => api.get('/wishlist/'),
+  get: (params) => api.get('/wishlist/', { params }),
   add: (productId) => api.post(`/wishlist/add/${productId}/`),
   remove: (productId) => api.delete(`/wishlist/remove/${productId}/`),
 };
@@ -98,6 +99,7 @@ export const analyticsAPI = {
   getRefundAnalytics: () => api.get('/admin/analytics/refunds/'),
   getAdminStats: () => api.get('/admin/analytics/stats/'),
   getDashboardStats: () => api.get('/admin/analytics/dashboard/'),
+  getSearchAnalytics: (params) => api.get('/admin/analytics/searches/', { params }),
 };
 
 export const adminAPI = {
@@ -110,6 +112,11 @@ export const adminAPI = {
   toggleProductStatus: (id) => api.put(`/admin/products/toggle/${id}/`),
   getProducts: () => api.get('/admin/products/'),
   deleteProduct: (id) => api.delete(`/admin/products/delete/${id}/`),
+  uploadProductVideo: (id, file) => {
+    const data = new FormData();
+    data.append('video', file);
+    return api.post(`/admin/products/${id}/video/`, data);
+  },
   
   // Categories
   getCategories: () => api.get('/categories/'),